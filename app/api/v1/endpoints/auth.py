@@ -10,11 +10,19 @@ Flow:
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import RedirectResponse, JSONResponse
 from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
-from google.auth.transport.requests import Request as GoogleRequest
 from pydantic import BaseModel
+from functools import lru_cache
+import json
 import os
 
+from app.services.gmail_service import (
+    GOOGLE_AUTH_REQUEST,
+    get_token_file,
+    invalidate_credentials_cache,
+    load_cached_credentials,
+    save_token,
+)
+
 
 # Response Models
 class AuthStatusResponse(BaseModel):
@@ -48,18 +56,30 @@ SCOPES = [
 ]
 
 
+@lru_cache(maxsize=1)
+def _load_client_config(creds_file: str) -> dict:
+    """Parse the OAuth client secrets file once per process."""
+    with open(creds_file) as f:
+        return json.load(f)
+
+
 def get_oauth_flow(redirect_uri: str) -> Flow:
-    """Create OAuth flow with dynamic redirect URI."""
+    """
+    Create OAuth flow with dynamic redirect URI.
+
+    The client secrets file is parsed once and cached; a fresh Flow is
+    still built per call because fetch_token() mutates flow state.
+    """
     creds_file = os.getenv("GOOGLE_CREDENTIALS_FILE", "credentials.json")
-    
+
     if not os.path.exists(creds_file):
         raise HTTPException(
             status_code=500,
             detail="credentials.json not found. Please configure Google OAuth."
         )
-    
-    flow = Flow.from_client_secrets_file(
-        creds_file,
+
+    flow = Flow.from_client_config(
+        _load_client_config(creds_file),
         scopes=SCOPES,
         redirect_uri=redirect_uri
     )
@@ -69,19 +89,19 @@ def get_oauth_flow(redirect_uri: str) -> Flow:
 @router.get("/status", response_model=AuthStatusResponse)
 def auth_status() -> AuthStatusResponse:
     """Check current authentication status."""
-    token_file = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
-    
-    if not os.path.exists(token_file):
-        return AuthStatusResponse(
-            authenticated=False,
-            expired=True,
-            has_refresh_token=False,
-            message="No token found. Please sign in."
-        )
-    
+    token_file = get_token_file()
+
     try:
-        creds = Credentials.from_authorized_user_file(token_file, SCOPES)
-        
+        creds = load_cached_credentials()
+
+        if creds is None:
+            return AuthStatusResponse(
+                authenticated=False,
+                expired=True,
+                has_refresh_token=False,
+                message="No token found. Please sign in."
+            )
+
         if creds.valid:
             return {
                 "authenticated": True,
@@ -92,10 +112,9 @@ def auth_status() -> AuthStatusResponse:
         elif creds.expired and creds.refresh_token:
             # Try to refresh
             try:
-                creds.refresh(GoogleRequest())
-                # Save refreshed token
-                with open(token_file, "w") as f:
-                    f.write(creds.to_json())
+                creds.refresh(GOOGLE_AUTH_REQUEST)
+                # Save refreshed token (atomic write)
+                save_token(creds, token_file)
                 return {
                     "authenticated": True,
                     "expired": False,
@@ -186,11 +205,10 @@ def callback(request: Request, code: str = None, error: str = None):
         flow.fetch_token(code=code)
         credentials = flow.credentials
         
-        # Save credentials
-        token_file = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
-        with open(token_file, "w") as f:
-            f.write(credentials.to_json())
-        
+        # Save credentials (atomic write)
+        token_file = get_token_file()
+        save_token(credentials, token_file)
+
         return JSONResponse(
             content={
                 "success": True,
@@ -218,17 +236,17 @@ def refresh_token():
     
     Use this if the token is expired but has a refresh token.
     """
-    token_file = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
-    
+    token_file = get_token_file()
+
     if not os.path.exists(token_file):
         raise HTTPException(
             status_code=400,
             detail="No token file found. Please sign in first via /auth/login"
         )
-    
+
     try:
-        creds = Credentials.from_authorized_user_file(token_file, SCOPES)
-        
+        creds = load_cached_credentials()
+
         if not creds.refresh_token:
             raise HTTPException(
                 status_code=400,
@@ -236,12 +254,11 @@ def refresh_token():
             )
         
         # Force refresh
-        creds.refresh(GoogleRequest())
-        
-        # Save refreshed token
-        with open(token_file, "w") as f:
-            f.write(creds.to_json())
-        
+        creds.refresh(GOOGLE_AUTH_REQUEST)
+
+        # Save refreshed token (atomic write)
+        save_token(creds, token_file)
+
         return {
             "success": True,
             "message": "Token refreshed successfully.",
@@ -262,10 +279,11 @@ def logout():
     
     After this, you'll need to sign in again via /auth/login.
     """
-    token_file = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
-    
+    token_file = get_token_file()
+
     if os.path.exists(token_file):
         os.remove(token_file)
+        invalidate_credentials_cache()
         return {"success": True, "message": "Logged out. Token deleted."}
-    
+
     return {"success": True, "message": "Already logged out. No token found."}
@@ -2,23 +2,98 @@
 Debug endpoints for testing Gmail integration and extraction pipeline.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.services.gmail_service import get_gmail_service, get_full_message
+from app.services.gmail_service import get_gmail_service, get_full_messages
 from app.services.email_extractor import extract_placement_info
 from app.services import db_service
-from app.database import get_db
+from app.services.cache import TTLCache
+from app.database import get_db, db_scope
+from app.models import Email, PlacementDrive
+from app.services.langgraph_pipeline import (
+    run_langgraph_pipeline_batch,
+    pipeline_result_to_json,
+)
+from datetime import datetime
+import json
+import logging
 import os
+import re
+import threading
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/debug", tags=["Debug"])
 
+# Gmail search query matching the placement coordinators - built once
+# instead of being re-assembled inside every extract endpoint
+_PLACEMENT_QUERY = (
+    "from:(navanita@iiit-bh.ac.in OR "
+    "rajashree@iiit-bh.ac.in OR "
+    "placement@iiit-bh.ac.in)"
+)
+
+# Generic phrases that mean an extracted "company" is really a notice
+# subject, not a company name. Compiled into one alternation so
+# validation does a single scan instead of ~30 substring checks per name.
+_COMPANY_BLACKLIST = (
+    "campus drive", "recruitment drive", "placement", "important notice",
+    "batch", "welcome", "continued participation", "students", "reminder",
+    "absentees", "shortlist", "interview", "test result", "announcement",
+    "registration", "urgent", "follow up", "the batch", "all students",
+    "assessment", "online test", "technical round", "hr round",
+    "internship program", "session 2025", "session 2026", "passout",
+    "software developer", "software engineer", "associate system", "intern",
+)
+_COMPANY_BLACKLIST_RE = re.compile(
+    "|".join(re.escape(phrase) for phrase in _COMPANY_BLACKLIST)
+)
+_UPPERCASE_RE = re.compile(r"[A-Z]")
+
+
+def _parse_iso_date(value):
+    """Parse an ISO date string (C-implemented fast path); None on failure."""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_valid_company(name: str) -> bool:
+    """Check if company_name looks like a real company."""
+    # Too short or too long is suspicious
+    if not name or len(name) < 3 or len(name) > 50:
+        return False
+    if _COMPANY_BLACKLIST_RE.search(name.lower()):
+        return False
+    # Must have at least one capital letter (proper noun)
+    return _UPPERCASE_RE.search(name) is not None
+
+
+# Fields filled in from later emails of the same company when merging
+# pipeline results in /gmail/process-pipeline
+_MERGE_FIELDS = (
+    "role", "drive_type", "batch", "drive_date",
+    "registration_deadline", "eligible_branches",
+    "min_cgpa", "eligibility_text", "ctc_or_stipend",
+    "job_location", "registration_link",
+)
+
+# /db/stats only changes when an extract runs; cache it briefly and
+# invalidate from the extract endpoints after they commit.
+_db_stats_cache = TTLCache(ttl_seconds=60)
+
 
 @router.get("/gmail")
-def test_gmail_read():
+def test_gmail_read(
+    include_body: bool = Query(True, description="Fetch full bodies; False returns headers only")
+):
     """
     Test endpoint to verify Gmail API integration.
 
-    Fetches the 5 most recent emails and returns metadata WITH BODY.
+    Fetches the 5 most recent emails and returns metadata WITH BODY
+    (pass include_body=false for a much lighter headers-only fetch).
     On first request, triggers OAuth flow (browser opens for authentication).
 
     Returns:
@@ -30,17 +105,27 @@ def test_gmail_read():
     # List most recent messages
     results = service.users().messages().list(
         userId="me",
-        maxResults=5
+        maxResults=5,
+        fields="messages/id,nextPageToken"
     ).execute()
 
     messages = results.get("messages", [])
 
     response = []
 
-    # Fetch full message for each
+    # Fetch all messages in one batched round trip; headers-only when
+    # the caller doesn't want bodies (format=metadata, ~5-20x fewer bytes)
+    mails = get_full_messages(
+        service,
+        [msg["id"] for msg in messages],
+        include_body=include_body
+    )
+
     for msg in messages:
-        mail = get_full_message(service, msg["id"])
-        
+        mail = mails.get(msg["id"])
+        if mail is None:
+            continue
+
         response.append({
             "id": msg["id"],
             "from": mail.get("from"),
@@ -71,53 +156,47 @@ def extract_from_latest(db: Session = Depends(get_db), batch_size: int = 50):
     # Get authenticated Gmail service
     service = get_gmail_service()
 
-    # Gmail query to filter placement coordinator emails
-    query = (
-        "from:(navanita@iiit-bh.ac.in OR "
-        "rajashree@iiit-bh.ac.in OR "
-        "placement@iiit-bh.ac.in)"
-    )
-
-    # Search for messages matching the query
+    # Search for messages matching the placement-sender query
     results = service.users().messages().list(
         userId="me",
-        q=query,
-        maxResults=batch_size
+        q=_PLACEMENT_QUERY,
+        maxResults=batch_size,
+        fields="messages/id,nextPageToken"
     ).execute()
 
     messages = results.get("messages", [])
     
-    emails_saved = 0
     new_emails = 0
-    drives_saved = []
+    drives_saved: set[str] = set()
     skipped = 0
 
-    # Process each message
-    for msg in messages:
-        msg_id = msg["id"]
-        
-        # Check if already processed
-        from app.models import Email
-        existing = db.query(Email).filter(Email.gmail_message_id == msg_id).first()
-        if existing:
-            skipped += 1
-            continue
-        
-        # Get full message with body content
-        mail = get_full_message(service, msg_id)
+    # Skip already-processed messages (single IN query), then batch-fetch the rest
+    msg_ids = [msg["id"] for msg in messages]
+    existing_ids = {
+        row[0] for row in
+        db.query(Email.gmail_message_id).filter(Email.gmail_message_id.in_(msg_ids)).all()
+    } if msg_ids else set()
 
-        # Save email to database
-        email = db_service.save_email(
-            db=db,
-            gmail_message_id=msg_id,
-            sender=mail["from"],
-            subject=mail["subject"],
-            raw_body=mail["body"]
-        )
-        new_emails += 1
-        emails_saved += 1
+    to_fetch = [msg_id for msg_id in msg_ids if msg_id not in existing_ids]
+    skipped = len(existing_ids)
+
+    mails = get_full_messages(service, to_fetch)
+
+    # Insert all new emails in one transaction
+    saved_emails = db_service.save_emails_bulk(db, [
+        {
+            "gmail_message_id": msg_id,
+            "sender": mails[msg_id]["from"],
+            "subject": mails[msg_id]["subject"],
+            "raw_body": mails[msg_id]["body"],
+        }
+        for msg_id in to_fetch if msg_id in mails
+    ])
+    new_emails = len(saved_emails)
 
-        # Extract placement information
+    # Extract placement info from each new message
+    for msg_id, email in saved_emails.items():
+        mail = mails[msg_id]
         info = extract_placement_info(mail["subject"], mail["body"])
 
         # Only save if extraction was successful AND has company name
@@ -128,139 +207,209 @@ def extract_from_latest(db: Session = Depends(get_db), batch_size: int = 50):
                 source_email_id=email.id,
                 role=info.get("role"),
                 batch=info.get("batch"),
-                official_source="TPO Email"
+                official_source="TPO Email",
+                commit=False
             )
-            
-            if info["company"] not in drives_saved:
-                drives_saved.append(info["company"])
+
+            drives_saved.add(info["company"])
+
+    # One commit for the whole batch of drive upserts
+    db.commit()
+
+    # New rows may have landed - drop the cached stats
+    _db_stats_cache.invalidate()
 
     return {
         "total_found": len(messages),
         "already_processed": skipped,
         "new_emails_saved": new_emails,
         "placements_saved": len(drives_saved),
-        "companies": drives_saved
+        "companies": sorted(drives_saved)
     }
 
 
 @router.get("/db/stats")
 def get_db_stats(db: Session = Depends(get_db)):
-    """Get database statistics."""
-    from app.models import Email, PlacementDrive
-    
+    """Get database statistics (cached for 60s)."""
+    cached = _db_stats_cache.get("db_stats")
+    if cached is not None:
+        return cached
+
     email_count = db.query(Email).count()
     drive_count = db.query(PlacementDrive).count()
-    
+
     # Get unique companies
     companies = db.query(PlacementDrive.company_name).distinct().all()
-    
-    return {
+
+    stats = {
         "emails_stored": email_count,
         "placement_drives": drive_count,
         "unique_companies": [c[0] for c in companies]
     }
+    _db_stats_cache.set("db_stats", stats)
+    return stats
+
+
+@router.get("/db/drives/export")
+def export_drives(db: Session = Depends(get_db)):
+    """
+    Stream every placement drive as NDJSON (one JSON object per line).
+
+    Rows are fetched with a server-side cursor (yield_per) and written
+    straight into the response, so memory stays constant regardless of
+    table size. Useful for dumping the table without timing out.
+    """
+    def generate():
+        for drive in db.query(PlacementDrive).order_by(PlacementDrive.id).yield_per(500):
+            yield json.dumps(drive.to_full_dict()) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# State of the (single) extract-all background job, keyed for the
+# /gmail/extract-all/status endpoint. One job at a time is enough here.
+_extract_all_lock = threading.Lock()
+_extract_all_job: dict = {"status": "idle"}
+
+
+def _run_extract_all_job():
+    """
+    Background worker for /gmail/extract-all (owns its own DB session).
+
+    Messages are processed page-by-page as the Gmail listing paginates,
+    so memory stays bounded by one page (~100 messages) and results
+    start landing in the DB while later pages are still being listed,
+    instead of materializing every message ID up front.
+    """
+    try:
+        with db_scope() as db:
+            service = get_gmail_service()
+
+            drives_saved: set[str] = set()
+            page_token = None
+
+            logger.info("Fetching all placement emails page by page...")
+            while True:
+                results = service.users().messages().list(
+                    userId="me",
+                    q=_PLACEMENT_QUERY,
+                    maxResults=100,
+                    pageToken=page_token,
+                    fields="messages/id,nextPageToken"
+                ).execute()
+
+                messages = results.get("messages", [])
+                _extract_all_job["total_emails_found"] += len(messages)
+
+                # Skip already-processed messages (single IN query per page),
+                # then batch-fetch the rest
+                msg_ids = [msg["id"] for msg in messages]
+                existing_ids = {
+                    row[0] for row in
+                    db.query(Email.gmail_message_id).filter(Email.gmail_message_id.in_(msg_ids)).all()
+                } if msg_ids else set()
+
+                to_fetch = [msg_id for msg_id in msg_ids if msg_id not in existing_ids]
+                mails = get_full_messages(service, to_fetch)
+
+                # Insert this page's new emails in one transaction
+                saved_emails = db_service.save_emails_bulk(db, [
+                    {
+                        "gmail_message_id": msg_id,
+                        "sender": mails[msg_id]["from"],
+                        "subject": mails[msg_id]["subject"],
+                        "raw_body": mails[msg_id]["body"],
+                    }
+                    for msg_id in to_fetch if msg_id in mails
+                ])
+                _extract_all_job["new_emails_saved"] += len(saved_emails)
+                _extract_all_job["to_process"] += len(saved_emails)
+
+                for msg_id, email in saved_emails.items():
+                    mail = mails[msg_id]
+
+                    # Extract placement info
+                    info = extract_placement_info(mail["subject"], mail["body"])
+
+                    if info and info.get("company"):
+                        db_service.upsert_placement_drive(
+                            db=db,
+                            company_name=info["company"],
+                            source_email_id=email.id,
+                            role=info.get("role"),
+                            batch=info.get("batch"),
+                            official_source="TPO Email",
+                            commit=False
+                        )
+                        if info["company"] not in drives_saved:
+                            drives_saved.add(info["company"])
+                            logger.info("New company: %s", info["company"])
+
+                    _extract_all_job["processed"] += 1
+
+                # One commit per page of drive upserts
+                db.commit()
+                logger.info(
+                    "Processed %d emails so far", _extract_all_job["processed"]
+                )
+
+                page_token = results.get("nextPageToken")
+                if not page_token:
+                    break
+
+            # New rows may have landed - drop the cached stats
+            _db_stats_cache.invalidate()
+
+            _extract_all_job.update({
+                "status": "completed",
+                "new_companies": len(drives_saved),
+                "companies": sorted(drives_saved),
+            })
+    except Exception as e:
+        logger.exception("extract-all job failed")
+        _extract_all_job.update({"status": "failed", "error": str(e)})
 
 
 @router.get("/gmail/extract-all")
-def extract_all_emails(db: Session = Depends(get_db)):
+def extract_all_emails(background_tasks: BackgroundTasks):
     """
     Extract ALL placement emails with automatic pagination.
-    
-    This processes all emails from placement coordinators,
-    skipping already-processed ones.
+
+    Runs as a background job so the request returns immediately instead
+    of holding the connection open for minutes. Poll
+    /debug/gmail/extract-all/status for progress and the final summary.
     """
-    service = get_gmail_service()
-    
-    query = (
-        "from:(navanita@iiit-bh.ac.in OR "
-        "rajashree@iiit-bh.ac.in OR "
-        "placement@iiit-bh.ac.in)"
-    )
-    
-    all_messages = []
-    page_token = None
-    
-    # Fetch all message IDs with pagination
-    print("📧 Fetching all placement emails...")
-    while True:
-        results = service.users().messages().list(
-            userId="me",
-            q=query,
-            maxResults=100,
-            pageToken=page_token
-        ).execute()
-        
-        messages = results.get("messages", [])
-        all_messages.extend(messages)
-        
-        page_token = results.get("nextPageToken")
-        if not page_token:
-            break
-    
-    print(f"📬 Found {len(all_messages)} total emails")
-    
-    # Process each message
-    from app.models import Email
-    new_emails = 0
-    drives_saved = []
-    
-    for i, msg in enumerate(all_messages):
-        msg_id = msg["id"]
-        
-        # Skip if already processed
-        existing = db.query(Email).filter(Email.gmail_message_id == msg_id).first()
-        if existing:
-            continue
-        
-        # Fetch and save
-        mail = get_full_message(service, msg_id)
-        
-        email = db_service.save_email(
-            db=db,
-            gmail_message_id=msg_id,
-            sender=mail["from"],
-            subject=mail["subject"],
-            raw_body=mail["body"]
-        )
-        new_emails += 1
-        
-        # Extract placement info
-        info = extract_placement_info(mail["subject"], mail["body"])
-        
-        if info and info.get("company"):
-            db_service.upsert_placement_drive(
-                db=db,
-                company_name=info["company"],
-                source_email_id=email.id,
-                role=info.get("role"),
-                batch=info.get("batch"),
-                official_source="TPO Email"
-            )
-            if info["company"] not in drives_saved:
-                drives_saved.append(info["company"])
-                print(f"   ✅ New company: {info['company']}")
-        
-        # Progress log every 10 emails
-        if (i + 1) % 10 == 0:
-            print(f"   Processed {i + 1}/{len(all_messages)}")
-    
+    with _extract_all_lock:
+        if _extract_all_job.get("status") == "running":
+            return {"status": "already_running", "progress": _extract_all_job}
+
+        _extract_all_job.clear()
+        _extract_all_job.update({
+            "status": "running",
+            "total_emails_found": 0,
+            "to_process": 0,
+            "processed": 0,
+            "new_emails_saved": 0,
+        })
+
+    background_tasks.add_task(_run_extract_all_job)
+
     return {
-        "total_emails_found": len(all_messages),
-        "new_emails_saved": new_emails,
-        "new_companies": len(drives_saved),
-        "companies": drives_saved
+        "status": "started",
+        "message": "Extraction running in background",
+        "status_endpoint": "/api/v1/debug/gmail/extract-all/status"
     }
 
 
-@router.get("/gmail/process-pipeline")
-def process_with_pipeline(
-    db: Session = Depends(get_db),
-    batch_size: int = Query(default=1, description="Number of emails to process"),
-    use_gemini: bool = Query(default=True, description="Use Gemini for enhanced extraction"),
-    save_to_db: bool = Query(default=False, description="Whether to save to database"),
-):
+@router.get("/gmail/extract-all/status")
+def extract_all_status():
+    """Progress/result of the last /gmail/extract-all run."""
+    return _extract_all_job
+
+
+def _run_pipeline(db: Session, batch_size: int, use_gemini: bool, save_to_db: bool) -> dict:
     """
-    Process emails through the full LangGraph pipeline.
+    Run the LangGraph pipeline over recent placement emails (blocking).
     
     Pipeline nodes (10 steps):
     1. filter_sender - Only TPO coordinators
@@ -276,24 +425,12 @@ def process_with_pipeline(
     
     Returns JSON with extracted fields for each email.
     """
-    from app.services.langgraph_pipeline import (
-        run_langgraph_pipeline,
-        pipeline_result_to_json,
-    )
-    from app.models import PlacementDrive
-
-    # Gmail query limited to allowed senders
-    query = (
-        "from:(navanita@iiit-bh.ac.in OR "
-        "rajashree@iiit-bh.ac.in OR "
-        "placement@iiit-bh.ac.in)"
-    )
-
     service = get_gmail_service()
     results = service.users().messages().list(
         userId="me",
-        q=query,
+        q=_PLACEMENT_QUERY,
         maxResults=batch_size,
+        fields="messages/id,nextPageToken",
     ).execute()
     messages = results.get("messages", [])
 
@@ -304,192 +441,145 @@ def process_with_pipeline(
             "processed": []
         }
 
-    # Step 1: Store all emails from TPO senders in Email table
-    from app.models import Email
+    # Step 1: Store all emails from TPO senders in Email table.
+    # One IN query finds the already-stored messages instead of a
+    # SELECT per message ID.
+    msg_ids = [msg["id"] for msg in messages]
+    existing_ids = {
+        row[0] for row in
+        db.query(Email.gmail_message_id).filter(Email.gmail_message_id.in_(msg_ids)).all()
+    }
+    new_ids = [msg_id for msg_id in msg_ids if msg_id not in existing_ids]
+
+    # Fetch all new messages in batched round trips instead of one
+    # messages.get call per email
     emails_stored = 0
-    for msg in messages:
-        # Check if already stored
-        existing = db.query(Email).filter(Email.gmail_message_id == msg["id"]).first()
-        if not existing:
-            mail = get_full_message(service, msg["id"])
-            email_record = Email(
-                gmail_message_id=msg["id"],
-                subject=mail.get("subject", ""),
-                sender=mail.get("from", ""),
-                raw_body=mail.get("body", ""),
-            )
-            db.add(email_record)
-            emails_stored += 1
+    mails = get_full_messages(service, new_ids)
+    for msg_id in new_ids:
+        mail = mails.get(msg_id)
+        if mail is None:
+            continue
+        email_record = Email(
+            gmail_message_id=msg_id,
+            subject=mail.get("subject", ""),
+            sender=mail.get("from", ""),
+            raw_body=mail.get("body", ""),
+        )
+        db.add(email_record)
+        emails_stored += 1
     db.commit()
 
     # Step 2: Get all stored placement emails and process with LangGraph
-    from app.models import PlacementDrive
     stored_emails = db.query(Email).filter(
         Email.sender.ilike("%navanita@iiit-bh.ac.in%") |
         Email.sender.ilike("%rajashree@iiit-bh.ac.in%") |
         Email.sender.ilike("%placement@iiit-bh.ac.in%")
     ).all()
 
-    # Existing drives for deduplication
-    existing_drives_query = db.query(PlacementDrive).all()
-    existing_drives = [
-        {
-            "company_name": d.company_name,
-            "role": d.role,
-            "registration_deadline": d.registration_deadline.isoformat() if d.registration_deadline else None,
-        }
-        for d in existing_drives_query
-    ]
+    # Existing drives for deduplication (column projection - no need to
+    # hydrate full ORM rows just to compare three fields)
+    existing_drives = db_service.get_drives_for_dedup(db)
 
     api_key = os.getenv("GOOGLE_API_KEY")
-    processed_results = []
-    
-    for email in stored_emails:
-        # Run LangGraph pipeline on stored emails
-        final_state = run_langgraph_pipeline(
-            email_id=str(email.id),
-            gmail_message_id=email.gmail_message_id,
-            sender=email.sender or "",
-            subject=email.subject or "",
-            raw_body=email.raw_body or "",
-            existing_drives=existing_drives,
-            api_key=api_key,
-            use_gemini=use_gemini,
-        )
-        
-        # Skip filtered emails
-        if final_state.get("status") == "filtered":
-            continue
-        
-        processed_results.append(pipeline_result_to_json(final_state))
+
+    # Run the pipeline over all stored emails concurrently - the Gemini
+    # calls are independent across emails, so they no longer serialize
+    final_states = run_langgraph_pipeline_batch(
+        emails=[
+            {
+                "email_id": str(email.id),
+                "gmail_message_id": email.gmail_message_id,
+                "sender": email.sender or "",
+                "subject": email.subject or "",
+                "raw_body": email.raw_body or "",
+            }
+            for email in stored_emails
+        ],
+        existing_drives=existing_drives,
+        api_key=api_key,
+        use_gemini=use_gemini,
+    )
+
+    # Skip filtered emails
+    processed_results = [
+        pipeline_result_to_json(state)
+        for state in final_states
+        if state.get("status") != "filtered"
+    ]
 
     # Merge results from same company for most accurate data
     def merge_company_results(results):
         """Combine results from multiple emails of same company."""
         company_map = {}
-        
+
         for result in results:
-            company = result.get("validated_data", {}).get("company_name")
+            vd = result.get("validated_data") or {}
+            company = vd.get("company_name")
             if not company:
                 continue
-            
+
             company_key = company.lower().strip()
-            
-            if company_key not in company_map:
-                company_map[company_key] = result.copy()
-            else:
-                # Merge: fill in nulls from other emails
-                existing = company_map[company_key]
-                for field in ["role", "drive_type", "batch", "drive_date", 
-                              "registration_deadline", "eligible_branches",
-                              "min_cgpa", "eligibility_text", "ctc_or_stipend",
-                              "job_location", "registration_link"]:
-                    existing_val = existing.get("validated_data", {}).get(field)
-                    new_val = result.get("validated_data", {}).get(field)
-                    if not existing_val and new_val:
-                        existing["validated_data"][field] = new_val
-                        existing["extracted_data"][field] = new_val
-                
-                # Take higher confidence
-                existing_conf = existing.get("validated_data", {}).get("confidence_score", 0)
-                new_conf = result.get("validated_data", {}).get("confidence_score", 0)
-                if new_conf > existing_conf:
-                    existing["validated_data"]["confidence_score"] = new_conf
-        
+            existing = company_map.get(company_key)
+
+            if existing is None:
+                # First sighting owns the entry; later emails merge into it
+                company_map[company_key] = result
+                continue
+
+            # Merge: fill in nulls from other emails
+            existing_vd = existing["validated_data"]
+            existing_ed = existing["extracted_data"]
+            for field in _MERGE_FIELDS:
+                new_val = vd.get(field)
+                if new_val and not existing_vd.get(field):
+                    existing_vd[field] = new_val
+                    existing_ed[field] = new_val
+
+            # Take higher confidence
+            if vd.get("confidence_score", 0) > existing_vd.get("confidence_score", 0):
+                existing_vd["confidence_score"] = vd.get("confidence_score")
+
         return list(company_map.values())
     
     merged_results = merge_company_results(processed_results)
 
-    # Save to database if requested
+    # Save to database if requested. Each merged result goes through the
+    # shared upsert - one ON CONFLICT round trip per company with the
+    # same name normalization, non-null merge and cache invalidation as
+    # every other drive write, instead of a hand-rolled prefetch/setattr
+    # variant of the same logic.
     saved_count = 0
-    # Filter out fake company names before saving
-    def is_valid_company(name):
-        """Check if company_name looks like a real company."""
-        if not name or len(name) < 3:
-            return False
-        name_lower = name.lower()
-        # Blacklist generic phrases
-        blacklist = [
-            "campus drive", "recruitment drive", "placement", "important notice",
-            "batch", "welcome", "continued participation", "students", "reminder",
-            "absentees", "shortlist", "interview", "test result", "announcement",
-            "registration", "urgent", "follow up", "the batch", "all students",
-            "assessment", "online test", "technical round", "hr round",
-            "internship program", "session 2025", "session 2026", "passout",
-            "software developer", "software engineer", "associate system", "intern"
-        ]
-        if any(bl in name_lower for bl in blacklist):
-            return False
-        # Must have at least one capital letter (proper noun)
-        if not any(c.isupper() for c in name):
-            return False
-        # Too long is suspicious
-        if len(name) > 50:
-            return False
-        return True
-    
     if save_to_db:
-        from datetime import datetime
         for result in merged_results:
             vd = result.get("validated_data", {})
             company_name = vd.get("company_name")
-            
+
             # Validate company name
-            if not company_name or not is_valid_company(company_name):
+            if not company_name or not _is_valid_company(company_name):
                 continue
-            
-            # Check if already exists (by company + batch)
-            existing = db.query(PlacementDrive).filter(
-                PlacementDrive.company_name == company_name,
-                PlacementDrive.batch == vd.get("batch")
-            ).first()
-            
-            if existing:
-                # Update existing record with new data
-                for field in ["role", "drive_type", "drive_date", "registration_deadline",
-                              "eligible_branches", "min_cgpa", "eligibility_text",
-                              "ctc_or_stipend", "job_location", "registration_link"]:
-                    new_val = vd.get(field)
-                    if new_val and not getattr(existing, field, None):
-                        setattr(existing, field, new_val)
-                # Update confidence if higher
-                if vd.get("confidence_score", 0) > (existing.confidence_score or 0):
-                    existing.confidence_score = vd.get("confidence_score")
-            else:
-                # Create new record
-                drive = PlacementDrive(
-                    company_name=company_name,
-                    role=vd.get("role"),
-                    drive_type=vd.get("drive_type"),
-                    batch=vd.get("batch"),
-                    eligible_branches=vd.get("eligible_branches"),
-                    min_cgpa=vd.get("min_cgpa"),
-                    eligibility_text=vd.get("eligibility_text"),
-                    ctc_or_stipend=vd.get("ctc_or_stipend"),
-                    job_location=vd.get("job_location"),
-                    registration_link=vd.get("registration_link"),
-                    status=vd.get("status", "upcoming"),
-                    confidence_score=vd.get("confidence_score", 0.5),
-                    official_source="TPO Email"
-                )
-                # Parse dates if present
-                if vd.get("registration_deadline"):
-                    try:
-                        drive.registration_deadline = datetime.strptime(
-                            vd["registration_deadline"], "%Y-%m-%d"
-                        )
-                    except: pass
-                if vd.get("drive_date"):
-                    try:
-                        from datetime import date
-                        drive.drive_date = datetime.strptime(
-                            vd["drive_date"], "%Y-%m-%d"
-                        ).date()
-                    except: pass
-                
-                db.add(drive)
-                saved_count += 1
-        
+
+            drive_date = _parse_iso_date(vd.get("drive_date"))
+            db_service.upsert_placement_drive(
+                db=db,
+                company_name=company_name,
+                role=vd.get("role"),
+                drive_type=vd.get("drive_type"),
+                batch=vd.get("batch"),
+                drive_date=drive_date.date() if drive_date else None,
+                registration_deadline=_parse_iso_date(vd.get("registration_deadline")),
+                eligible_branches=vd.get("eligible_branches"),
+                min_cgpa=vd.get("min_cgpa"),
+                eligibility_text=vd.get("eligibility_text"),
+                ctc_or_stipend=vd.get("ctc_or_stipend"),
+                job_location=vd.get("job_location"),
+                registration_link=vd.get("registration_link"),
+                status=vd.get("status", "upcoming"),
+                confidence_score=vd.get("confidence_score", 0.5),
+                official_source="TPO Email",
+                commit=False
+            )
+            saved_count += 1
+
         db.commit()
 
     return {
@@ -510,3 +600,76 @@ def process_with_pipeline(
         "merged_results": merged_results,
     }
 
+
+# State of the (single) process-pipeline background job, mirroring the
+# extract-all job registry above.
+_pipeline_job_lock = threading.Lock()
+_pipeline_job: dict = {"status": "idle"}
+
+
+def _run_pipeline_job(batch_size: int, use_gemini: bool, save_to_db: bool):
+    """Background worker for /gmail/process-pipeline (owns its own DB session)."""
+    try:
+        with db_scope() as db:
+            result = _run_pipeline(db, batch_size, use_gemini, save_to_db)
+        _pipeline_job.update({"status": "completed", "result": result})
+    except Exception as e:
+        logger.exception("process-pipeline job failed")
+        _pipeline_job.update({"status": "failed", "error": str(e)})
+
+
+@router.get("/gmail/process-pipeline")
+def process_with_pipeline(
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    batch_size: int = Query(default=1, description="Number of emails to process"),
+    use_gemini: bool = Query(default=True, description="Use Gemini for enhanced extraction"),
+    save_to_db: bool = Query(default=False, description="Whether to save to database"),
+    background: bool = Query(default=False, description="Run as a background job and return immediately"),
+):
+    """
+    Process emails through the full LangGraph pipeline.
+
+    Pipeline nodes (10 steps):
+    1. filter_sender - Only TPO coordinators
+    2. html_to_text - Clean HTML to plain text
+    3. remove_noise - Remove signatures, disclaimers, replies
+    4. token_safety - Trim to ~3000 tokens
+    5. extract_sections - URLs, dates, numbers
+    6. regex_extract - Pattern-based field extraction (ALWAYS runs)
+    7. gemini_enhance - Optional AI enhancement (if use_gemini=true)
+    8. validation - Normalize and verify data
+    9. deduplication - Prevent duplicates
+    10. map_to_model - PlacementDrive fields
+
+    Returns JSON with extracted fields for each email. Gemini calls can
+    take tens of seconds per email, so for larger batch_size pass
+    background=true: the pipeline then runs as a background job and this
+    returns immediately - poll /gmail/process-pipeline/status.
+    """
+    if background:
+        with _pipeline_job_lock:
+            if _pipeline_job.get("status") == "running":
+                return {"status": "already_running", "progress": _pipeline_job}
+
+            _pipeline_job.clear()
+            _pipeline_job.update({"status": "running"})
+
+        background_tasks.add_task(
+            _run_pipeline_job, batch_size, use_gemini, save_to_db
+        )
+
+        return {
+            "status": "started",
+            "message": "Pipeline running in background",
+            "status_endpoint": "/api/v1/debug/gmail/process-pipeline/status"
+        }
+
+    return _run_pipeline(db, batch_size, use_gemini, save_to_db)
+
+
+@router.get("/gmail/process-pipeline/status")
+def process_pipeline_status():
+    """Progress/result of the last background /gmail/process-pipeline run."""
+    return _pipeline_job
+
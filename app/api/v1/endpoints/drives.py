@@ -7,18 +7,43 @@ Card View: company_name, logo, role, batch, deadline, status
 Expanded View: eligibility, CTC, location, apply link
 """
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import date, datetime
 from typing import Optional
+import base64
+import hashlib
 
 from app.database import get_db
 from app.services import db_service
+from app.services.cache import dashboard_cache
 
 
 router = APIRouter(prefix="/drives", tags=["Dashboard"])
 
+# Statuses and drive types are fixed vocabularies (see DriveStatus /
+# DriveType enums), not derived from data
+DRIVE_STATUSES = ["upcoming", "open", "closed", "cancelled"]
+DRIVE_TYPES = ["internship", "fte", "both"]
+
+
+def _cached_payload(key, build):
+    """Fetch (etag, payload) from the dashboard cache, building on miss.
+
+    The cache lives in app.services.cache so the write path
+    (upsert_placement_drive) can bust it; reads here only ever see data
+    at most one drive-write old.
+    """
+    entry = dashboard_cache.get(key)
+    if entry is None:
+        payload = build()
+        etag = '"%s"' % hashlib.sha256(repr(payload).encode()).hexdigest()[:32]
+        entry = (etag, payload)
+        dashboard_cache.set(key, entry)
+    return entry
+
 
 # ============ Response Schemas ============
 
@@ -70,10 +95,11 @@ class DriveFullResponse(BaseModel):
 
 class DrivesListResponse(BaseModel):
     """Paginated list of placement drives."""
-    total: int
+    total: Optional[int] = None  # omitted in cursor mode (no count scan)
     skip: int
     limit: int
     drives: list[DriveCardResponse]
+    next_cursor: Optional[str] = None
 
 
 class FiltersResponse(BaseModel):
@@ -86,10 +112,55 @@ class FiltersResponse(BaseModel):
 
 # ============ LIST ENDPOINTS ============
 
+# Card fields in response order; rows from the card-column projection
+# carry these as attributes
+_CARD_FIELDS = tuple(DriveCardResponse.model_fields)
+
+
+def _card_dict(row) -> dict:
+    """Pick the card fields off a projected Row as a plain dict."""
+    return {name: getattr(row, name) for name in _CARD_FIELDS}
+
+
+def _list_response(drives, total, skip, limit) -> ORJSONResponse:
+    """Serialize a drives page straight to orjson.
+
+    The rows come from our own projection, so re-validating them
+    through the response model per request buys nothing; handing back
+    a prebuilt response skips Pydantic validation and jsonable_encoder
+    entirely (orjson handles the datetimes natively). The decorator
+    keeps response_model for the OpenAPI schema.
+    """
+    return ORJSONResponse({
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "drives": [_card_dict(row) for row in drives],
+        "next_cursor": _encode_cursor(drives[-1]) if len(drives) == limit else None,
+    })
+
+
+def _encode_cursor(drive) -> str:
+    """Opaque keyset cursor for a page's last row: (last_updated, id)."""
+    raw = f"{drive.last_updated.isoformat() if drive.last_updated else ''}|{drive.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor back to (last_updated, id); 400 on garbage."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        ts, _, drive_id = raw.rpartition("|")
+        return datetime.fromisoformat(ts), int(drive_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("", response_model=DrivesListResponse)
 def list_drives(
     skip: int = Query(0, ge=0, description="Offset for pagination"),
     limit: int = Query(50, ge=1, le=100, description="Max results"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from next_cursor (overrides skip)"),
     batch: Optional[str] = Query(None, description="Filter by batch, e.g. '2026'"),
     company: Optional[str] = Query(None, description="Filter by company name (partial match)"),
     status: Optional[str] = Query(None, description="Filter by status: upcoming, open, closed"),
@@ -98,21 +169,40 @@ def list_drives(
 ):
     """
     List placement drives with optional filtering.
-    
+
     **Query Parameters:**
     - `skip`: Offset for pagination (default 0)
     - `limit`: Max results per page (default 50, max 100)
+    - `cursor`: Opaque keyset cursor; pass the previous page's `next_cursor`
+      for O(limit) deep pagination (no offset scan, no count)
     - `batch`: Filter by exact batch (e.g., "2026")
     - `company`: Filter by company name (partial match, case-insensitive)
     - `status`: Filter by status (upcoming, open, closed)
     - `drive_type`: Filter by drive type (internship, fte, both)
-    
+
     **Example:**
     ```
     GET /api/v1/drives?batch=2026&status=open
     ```
     """
-    drives = db_service.get_all_drives(
+    if cursor:
+        # Keyset mode: range-scan exactly `limit` rows after the cursor;
+        # no offset discard, no count scan
+        after_last_updated, after_id = _decode_cursor(cursor)
+        drives = db_service.get_drives_keyset(
+            db=db,
+            limit=limit,
+            after_last_updated=after_last_updated,
+            after_id=after_id,
+            batch=batch,
+            company_name=company,
+            status=status,
+            drive_type=drive_type
+        )
+        return _list_response(drives, total=None, skip=0, limit=limit)
+
+    # One windowed query returns the page and the filtered total together
+    drives, total = db_service.get_drives_page(
         db=db,
         skip=skip,
         limit=limit,
@@ -121,175 +211,187 @@ def list_drives(
         status=status,
         drive_type=drive_type
     )
-    
-    total = db_service.get_drives_count(
-        db=db,
-        batch=batch,
-        company_name=company,
-        status=status,
-        drive_type=drive_type
-    )
-    
-    return DrivesListResponse(
-        total=total,
-        skip=skip,
-        limit=limit,
-        drives=drives
-    )
+
+    return _list_response(drives, total=total, skip=skip, limit=limit)
 
 
 # ============ FILTER OPTIONS ============
 # NOTE: Static routes MUST be defined BEFORE dynamic routes like /{drive_id}
 
 @router.get("/filters/options", response_model=FiltersResponse)
-def get_filter_options(db: Session = Depends(get_db)):
+def get_filter_options(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get available filter options for the dashboard.
-    
+
     Returns unique values for:
     - Companies (for dropdown)
     - Batches (for dropdown)
     - Statuses (fixed list)
     - Drive types (fixed list)
+
+    Cached until the next drive write (5 min TTL cap) with an ETag;
+    send If-None-Match to get a 304.
     """
-    return FiltersResponse(
-        companies=db_service.get_unique_companies(db),
-        batches=db_service.get_unique_batches(db),
-        statuses=["upcoming", "open", "closed", "cancelled"],
-        drive_types=["internship", "fte", "both"]
-    )
+    etag, payload = _cached_payload("filters", lambda: {
+        "companies": db_service.get_unique_companies(db),
+        "batches": db_service.get_unique_batches(db),
+        "statuses": DRIVE_STATUSES,
+        "drive_types": DRIVE_TYPES
+    })
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return payload
 
 
 # ============ STATS & SUMMARY ============
 
 @router.get("/stats/summary")
-def get_placement_stats(db: Session = Depends(get_db)):
+def get_placement_stats(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get comprehensive placement statistics and summary.
-    
+
     Returns:
     - Total companies
     - Breakdown by batch, status, location
     - Top CTC ranges
     - Recent drives
+
+    Cached until the next drive write (5 min TTL cap) with an ETag;
+    send If-None-Match to get a 304.
     """
     from app.models import PlacementDrive
-    from sqlalchemy import func
-    
-    # Total companies
-    total = db.query(PlacementDrive).count()
-    
-    # By batch
-    by_batch = db.query(
-        PlacementDrive.batch, 
-        func.count(PlacementDrive.id)
-    ).group_by(PlacementDrive.batch).all()
-    
-    # By status
-    by_status = db.query(
-        PlacementDrive.status,
-        func.count(PlacementDrive.id)
-    ).group_by(PlacementDrive.status).all()
-    
-    # By location
-    by_location = db.query(
-        PlacementDrive.job_location,
-        func.count(PlacementDrive.id)
-    ).filter(PlacementDrive.job_location.isnot(None)).group_by(
-        PlacementDrive.job_location
-    ).order_by(func.count(PlacementDrive.id).desc()).limit(10).all()
-    
-    # Recent 10 companies
-    recent = db.query(PlacementDrive).order_by(
-        PlacementDrive.id.desc()
-    ).limit(10).all()
-    
-    return {
-        "total_companies": total,
-        "by_batch": {b[0]: b[1] for b in by_batch if b[0]},
-        "by_status": {s[0]: s[1] for s in by_status if s[0]},
-        "top_locations": {l[0]: l[1] for l in by_location if l[0]},
-        "recent_companies": [
-            {
-                "id": d.id,
-                "company_name": d.company_name,
-                "role": d.role,
-                "ctc_or_stipend": d.ctc_or_stipend,
-                "eligible_branches": d.eligible_branches,
-                "job_location": d.job_location
-            }
-            for d in recent
-        ]
-    }
+
+    def build():
+        # Total / by-batch / by-status / top-locations in one round trip
+        stats = db_service.get_drive_stats(db)
+
+        # Recent 10 companies
+        recent = db.query(PlacementDrive).order_by(
+            PlacementDrive.id.desc()
+        ).limit(10).all()
+
+        return {
+            "total_companies": stats["total"],
+            "by_batch": stats["by_batch"],
+            "by_status": stats["by_status"],
+            "top_locations": stats["top_locations"],
+            "recent_companies": [
+                {
+                    "id": d.id,
+                    "company_name": d.company_name,
+                    "role": d.role,
+                    "ctc_or_stipend": d.ctc_or_stipend,
+                    "eligible_branches": d.eligible_branches,
+                    "job_location": d.job_location
+                }
+                for d in recent
+            ]
+        }
+
+    etag, payload = _cached_payload("stats", build)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return payload
 
 
 @router.get("/all/detailed")
 def get_all_drives_detailed(
+    request: Request,
+    response: Response,
     batch: Optional[str] = Query(None, description="Filter by batch"),
     db: Session = Depends(get_db)
 ):
     """
     Get all placement drives with full details.
-    
+
     Returns every field for each drive in a flat list.
     Useful for frontend to display complete placement data.
+
+    Cached until the next drive write (5 min TTL cap) with an ETag;
+    send If-None-Match to get a 304.
     """
     from app.models import PlacementDrive
-    
-    query = db.query(PlacementDrive)
-    if batch:
-        query = query.filter(PlacementDrive.batch == batch)
-    
-    drives = query.order_by(PlacementDrive.company_name).all()
-    
-    return {
-        "total": len(drives),
-        "batch_filter": batch,
-        "drives": [
-            {
-                "id": d.id,
-                "company_name": d.company_name,
-                "role": d.role,
-                "drive_type": d.drive_type,
-                "drive_date": d.drive_date.isoformat() if d.drive_date else None,
-                "registration_deadline": d.registration_deadline.isoformat() if d.registration_deadline else None,
-                "eligible_branches": d.eligible_branches,
-                "min_cgpa": d.min_cgpa,
-                "ctc_or_stipend": d.ctc_or_stipend,
-                "job_location": d.job_location,
-                "registration_link": d.registration_link,
-                "confidence_score": d.confidence_score,
-                "official_source": d.official_source
-            }
-            for d in drives
-        ]
-    }
+    from sqlalchemy import select
+
+    def build():
+        # Column projection: Row mappings go straight to dicts with no
+        # ORM hydration, and orjson serializes the date objects natively
+        stmt = select(
+            PlacementDrive.id,
+            PlacementDrive.company_name,
+            PlacementDrive.role,
+            PlacementDrive.drive_type,
+            PlacementDrive.drive_date,
+            PlacementDrive.registration_deadline,
+            PlacementDrive.eligible_branches,
+            PlacementDrive.min_cgpa,
+            PlacementDrive.ctc_or_stipend,
+            PlacementDrive.job_location,
+            PlacementDrive.registration_link,
+            PlacementDrive.confidence_score,
+            PlacementDrive.official_source,
+        )
+        if batch:
+            stmt = stmt.where(PlacementDrive.batch == batch)
+        stmt = stmt.order_by(PlacementDrive.company_name)
+
+        drives = [dict(row._mapping) for row in db.execute(stmt)]
+
+        return {
+            "total": len(drives),
+            "batch_filter": batch,
+            "drives": drives
+        }
+
+    etag, payload = _cached_payload(("detailed", batch), build)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return payload
 
 
 # ============ SINGLE DRIVE ============
 # NOTE: This dynamic route MUST be defined AFTER all static routes
 
 @router.get("/{drive_id}", response_model=DriveFullResponse)
-def get_drive(drive_id: int, db: Session = Depends(get_db)):
+def get_drive(drive_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Get a single placement drive by ID (expanded view).
-    
+
     Returns all fields including eligibility, CTC, location, etc.
-    
+    A weak ETag derived from last_updated lets browsers revalidate
+    with If-None-Match and skip the body on a 304.
+
     **Path Parameters:**
     - `drive_id`: The ID of the placement drive
-    
+
     **Returns:**
     - 200: Complete drive details
+    - 304: Not modified (If-None-Match matched)
     - 404: Drive not found
     """
     drive = db_service.get_drive_by_id(db, drive_id)
-    
+
     if not drive:
         raise HTTPException(
             status_code=404,
             detail=f"Placement drive with ID {drive_id} not found"
         )
-    
+
+    # Weak because distinct sub-second updates can share a timestamp
+    if drive.last_updated:
+        etag = f'W/"{int(drive.last_updated.timestamp())}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
     return drive
 
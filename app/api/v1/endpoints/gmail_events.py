@@ -4,46 +4,117 @@ Gmail Push Notification Webhook (Refactored).
 Streamlined endpoints using the refactored LangGraph pipeline.
 """
 
-from fastapi import APIRouter, Request, Depends
+from fastapi import APIRouter, BackgroundTasks, Request, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
 import base64
-import json
+import logging
+import orjson
 import os
 from typing import List, Dict
 
-from app.database import get_db
-from app.services.gmail_service import get_gmail_service, get_full_message, get_history_since
-from app.services.langgraph_pipeline import run_langgraph_pipeline
+from app.database import get_db, db_scope
+from app.services.gmail_service import get_gmail_service, get_full_messages, get_history_since
+from app.services.langgraph_pipeline import run_langgraph_pipeline, is_allowed_sender
+from app.services.gemini_extractor import build_drive_index
 from app.services import db_service
+from app.services.cache import dashboard_cache
 from app.models.email import Email
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/gmail", tags=["Gmail Push"])
 HISTORY_ID_KEY = "gmail_history_id"
 
+# Concurrent pipeline runs per webhook batch; each waits mostly on
+# Gemini and DB I/O, so a small pool overlaps them
+PIPELINE_WORKERS = int(os.getenv("GMAIL_PIPELINE_WORKERS", "8"))
+
+
+def _get_existing_drives(db: Session) -> Dict[str, list]:
+    """Get the dedup index of existing drives (see build_drive_index).
+
+    Cached in the shared dashboard cache so back-to-back Gmail pushes
+    don't rebuild the 1000-row index each time; any drive upsert busts
+    the whole cache, so a stale index never outlives a write.
+    """
+    index = dashboard_cache.get("gmail_dedup")
+    if index is None:
+        index = build_drive_index(db_service.get_drives_for_dedup(db, limit=1000))
+        dashboard_cache.set("gmail_dedup", index)
+    return index
+
 
-def _get_existing_drives(db: Session) -> List[Dict]:
-    """Get existing drives for deduplication."""
-    drives = db_service.get_all_drives(db, limit=1000)
-    return [
+def _filter_new_message_ids(db: Session, message_ids: List[str]) -> List[str]:
+    """Drop already-stored message ids with a single IN query."""
+    if not message_ids:
+        return []
+    existing_ids = {
+        row[0] for row in
+        db.query(Email.gmail_message_id).filter(Email.gmail_message_id.in_(message_ids)).all()
+    }
+    return [msg_id for msg_id in message_ids if msg_id not in existing_ids]
+
+
+def _save_emails_batch(db: Session, message_ids: List[str], messages: Dict) -> None:
+    """Insert all fetched emails in one flush + commit.
+
+    The pipeline's save node then hits the ON CONFLICT fast path per
+    row instead of paying an INSERT + commit per message.
+    """
+    db_service.save_emails_bulk(db, [
         {
-            "company_name": d.company_name,
-            "role": d.role,
-            "registration_deadline": d.registration_deadline.isoformat() if d.registration_deadline else None,
-            "batch": d.batch
+            "gmail_message_id": msg_id,
+            "sender": messages[msg_id]["from"],
+            "subject": messages[msg_id]["subject"],
+            "raw_body": messages[msg_id]["body"],
         }
-        for d in drives
-    ]
+        for msg_id in message_ids if msg_id in messages
+    ])
 
 
-def _process_message(db: Session, service, msg_id: str, existing_drives: List[Dict]) -> Dict:
-    """Process a single Gmail message through the LangGraph pipeline."""
-    # Check if already processed
-    if db.query(Email).filter(Email.gmail_message_id == msg_id).first():
-        return {"status": "skipped", "reason": "already_processed"}
-    
-    # Fetch full message
-    msg = get_full_message(service, msg_id)
-    
+def _fetch_new_messages(service, new_ids: List[str]) -> tuple:
+    """Fetch messages in two phases: headers first, bodies for survivors.
+
+    A metadata batch (Subject/From only) costs a fraction of the bytes
+    of a full fetch, and the sender allowlist alone rejects most inbox
+    noise - so unknown senders never pay for their HTML bodies. The
+    keyword filter still runs in the pipeline, since it needs the body.
+
+    Returns (messages, rejected_ids) where messages maps id -> full
+    parsed message for allowed senders and rejected_ids lists the
+    dropped ones. Rejected mail is never stored - the emails table is
+    an audit/reprocessing record, not a seen-ids ledger - so the
+    webhook relies on the advancing history cursor to not re-list
+    them, and the manual inbox scan only ever re-pays their headers.
+    Ids whose metadata fetch failed fall through to the full fetch,
+    which reports failures as before. Single messages skip the
+    metadata phase - two round trips for one body would cost more
+    than it saves.
+    """
+    if len(new_ids) <= 1:
+        return get_full_messages(service, new_ids), []
+
+    metadata = get_full_messages(service, new_ids, include_body=False)
+    allowed_ids = []
+    rejected_ids = []
+    for msg_id in new_ids:
+        meta = metadata.get(msg_id)
+        if meta is not None and not is_allowed_sender(meta["from"]):
+            rejected_ids.append(msg_id)
+        else:
+            allowed_ids.append(msg_id)
+
+    return get_full_messages(service, allowed_ids), rejected_ids
+
+
+def _process_message(db: Session, msg_id: str, msg: Dict, existing_drives: Dict) -> Dict:
+    """Process one prefetched Gmail message through the LangGraph pipeline.
+
+    Callers are expected to have already filtered out processed ids
+    (see _filter_new_message_ids).
+    """
     # Run pipeline (now handles DB save internally)
     result = run_langgraph_pipeline(
         email_id=str(msg_id),
@@ -66,30 +137,112 @@ def _process_message(db: Session, service, msg_id: str, existing_drives: List[Di
     }
 
 
+def _run_pipeline_jobs(db: Session, new_ids: List[str], messages: Dict,
+                       existing_drives: Dict, errors: List[Dict]) -> List[tuple]:
+    """Run _process_message per fetched message, concurrently when several.
+
+    Sessions are not thread-safe, so each pool worker opens its own
+    via db_scope. Returns (msg_id, result) pairs in input order;
+    missing fetches and per-message failures land in `errors`.
+    """
+    pairs = []
+    for msg_id in new_ids:
+        msg = messages.get(msg_id)
+        if msg is None:
+            errors.append({"id": msg_id, "error": "fetch failed"})
+        else:
+            pairs.append((msg_id, msg))
+
+    if len(pairs) <= 1:
+        outcomes = []
+        for msg_id, msg in pairs:
+            try:
+                outcomes.append((msg_id, _process_message(db, msg_id, msg, existing_drives)))
+            except Exception as e:
+                errors.append({"id": msg_id, "error": str(e)})
+        return outcomes
+
+    def _job(msg_id, msg):
+        with db_scope() as job_db:
+            return _process_message(job_db, msg_id, msg, existing_drives)
+
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=min(PIPELINE_WORKERS, len(pairs))) as pool:
+        futures = [(msg_id, pool.submit(_job, msg_id, msg)) for msg_id, msg in pairs]
+        for msg_id, future in futures:
+            try:
+                outcomes.append((msg_id, future.result()))
+            except Exception as e:
+                errors.append({"id": msg_id, "error": str(e)})
+    return outcomes
+
+
 @router.post("/events")
-async def gmail_events(request: Request, db: Session = Depends(get_db)):
-    """Webhook for Gmail push notifications via Pub/Sub."""
-    body = await request.json()
-    
+async def gmail_events(request: Request, background_tasks: BackgroundTasks):
+    """Webhook for Gmail push notifications via Pub/Sub.
+
+    ACKs immediately: Pub/Sub retries pushes that aren't answered
+    within the ack deadline, so the Gmail fetch + pipeline work runs
+    as a background task after the response is sent.
+    """
+    # Read the raw bytes once and parse the envelope with orjson
+    # instead of Starlette's stdlib-json request.json()
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        return {"status": "error", "reason": "invalid JSON body"}
+
     if "message" not in body:
         return {"status": "ignored", "reason": "no message field"}
-    
+
     data = body["message"].get("data")
     if not data:
         return {"status": "ignored", "reason": "no data field"}
-    
+
     try:
-        payload = json.loads(base64.b64decode(data).decode("utf-8"))
+        # orjson parses the decoded bytes directly - no utf-8 str hop
+        payload = orjson.loads(base64.b64decode(data))
     except Exception as e:
         return {"status": "error", "reason": f"decode failed: {e}"}
-    
+
     email_address = payload.get("emailAddress")
     new_history_id = payload.get("historyId")
-    print(f"📧 Gmail notification: {email_address}, historyId: {new_history_id}")
-    
+    logger.info("Gmail notification: %s, historyId: %s", email_address, new_history_id)
+
+    background_tasks.add_task(_notification_worker, email_address, new_history_id)
+    return {"status": "queued", "email": email_address, "historyId": new_history_id}
+
+
+def _notification_worker(email_address: str, new_history_id) -> None:
+    """Process a notification after the ACK, on its own session.
+
+    The request-scoped session is closed once the response goes out,
+    so the worker opens its own via db_scope.
+    """
+    with db_scope() as db:
+        result = _handle_notification(db, email_address, new_history_id)
+    logger.info(
+        "Notification done: %s, saved=%s, errors=%s",
+        result.get("status"), result.get("drives_saved", 0), result.get("errors", 0)
+    )
+
+
+def _handle_notification(db: Session, email_address: str, new_history_id) -> Dict:
+    """Process a Pub/Sub notification (blocking - call off the event loop)."""
     last_history_id = db_service.get_sync_state(db, HISTORY_ID_KEY)
+
+    # Pub/Sub redelivers: a historyId at or behind our cursor means the
+    # mailbox changes were already picked up, so skip the Gmail work
+    if last_history_id and new_history_id:
+        try:
+            if int(new_history_id) <= int(last_history_id):
+                logger.info("Stale historyId %s (cursor %s) - ignoring", new_history_id, last_history_id)
+                return {"status": "ignored", "reason": "stale_historyId"}
+        except (TypeError, ValueError):
+            pass  # Non-numeric ids - fall through and process normally
+
     results = {"saved": [], "filtered": 0, "errors": []}
-    
+
     try:
         service = get_gmail_service()
         existing_drives = _get_existing_drives(db)
@@ -100,30 +253,32 @@ async def gmail_events(request: Request, db: Session = Depends(get_db)):
         else:
             resp = service.users().messages().list(userId="me", maxResults=10, q="is:unread").execute()
             message_ids = [m["id"] for m in resp.get("messages", [])]
-        
-        print(f"   📬 Processing {len(message_ids)} messages")
-        
-        for msg_id in message_ids:
-            try:
-                result = _process_message(db, service, msg_id, existing_drives)
-                
-                if result["status"] == "saved":
-                    results["saved"].append({"company": result["company"], "drive_id": result["drive_id"]})
-                elif result["status"] == "filtered":
-                    results["filtered"] += 1
-                elif result.get("error"):
-                    results["errors"].append({"id": msg_id, "error": result["error"]})
-            except Exception as e:
-                results["errors"].append({"id": msg_id, "error": str(e)})
-        
+
+        new_ids = _filter_new_message_ids(db, message_ids)
+        logger.info("Processing %d new of %d messages", len(new_ids), len(message_ids))
+
+        # Headers-only batch first, full bodies only for allowed
+        # senders, then one bulk insert for the email rows
+        messages, rejected_ids = _fetch_new_messages(service, new_ids)
+        _save_emails_batch(db, new_ids, messages)
+        results["filtered"] += len(rejected_ids)
+
+        pipeline_ids = [msg_id for msg_id in new_ids if msg_id not in rejected_ids]
+        for msg_id, result in _run_pipeline_jobs(db, pipeline_ids, messages, existing_drives, results["errors"]):
+            if result["status"] == "saved":
+                results["saved"].append({"company": result["company"], "drive_id": result["drive_id"]})
+            elif result["status"] == "filtered":
+                results["filtered"] += 1
+            elif result.get("error"):
+                results["errors"].append({"id": msg_id, "error": result["error"]})
+
         if new_history_id:
             db_service.set_sync_state(db, HISTORY_ID_KEY, new_history_id)
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Notification processing failed for historyId %s", new_history_id)
         return {"status": "error", "reason": str(e)}
-    
+
     return {
         "status": "processed",
         "email": email_address,
@@ -139,30 +294,37 @@ async def gmail_events(request: Request, db: Session = Depends(get_db)):
 @router.post("/process-now")
 async def process_emails_now(db: Session = Depends(get_db)):
     """Manually trigger email processing."""
-    print("🔄 Manual email processing triggered")
-    
+    logger.info("Manual email processing triggered")
+    return await run_in_threadpool(_process_inbox, db)
+
+
+def _process_inbox(db: Session) -> Dict:
+    """Fetch and process recent inbox messages (blocking - call off the event loop)."""
     results = {"saved": [], "filtered": 0, "errors": []}
-    
+
     try:
         service = get_gmail_service()
         existing_drives = _get_existing_drives(db)
         
         resp = service.users().messages().list(userId="me", maxResults=20, labelIds=["INBOX"]).execute()
-        messages = resp.get("messages", [])
-        print(f"📬 Found {len(messages)} emails to process")
-        
-        for msg_meta in messages:
-            try:
-                result = _process_message(db, service, msg_meta["id"], existing_drives)
-                
-                if result["status"] == "saved":
-                    results["saved"].append(result["company"])
-                elif result["status"] in ("filtered", "duplicate"):
-                    results["filtered"] += 1
-                elif result.get("error"):
-                    results["errors"].append({"id": msg_meta["id"], "error": result["error"]})
-            except Exception as e:
-                results["errors"].append({"id": msg_meta["id"], "error": str(e)})
+        message_ids = [m["id"] for m in resp.get("messages", [])]
+        new_ids = _filter_new_message_ids(db, message_ids)
+        logger.info("Found %d new of %d emails to process", len(new_ids), len(message_ids))
+
+        # Headers-only batch first, full bodies only for allowed
+        # senders, then one bulk insert for the email rows
+        messages, rejected_ids = _fetch_new_messages(service, new_ids)
+        _save_emails_batch(db, new_ids, messages)
+        results["filtered"] += len(rejected_ids)
+
+        pipeline_ids = [msg_id for msg_id in new_ids if msg_id not in rejected_ids]
+        for msg_id, result in _run_pipeline_jobs(db, pipeline_ids, messages, existing_drives, results["errors"]):
+            if result["status"] == "saved":
+                results["saved"].append(result["company"])
+            elif result["status"] in ("filtered", "duplicate"):
+                results["filtered"] += 1
+            elif result.get("error"):
+                results["errors"].append({"id": msg_id, "error": result["error"]})
         
         return {
             "status": "success",
@@ -174,6 +336,5 @@ async def process_emails_now(db: Session = Depends(get_db)):
         }
         
     except Exception as e:
-        import traceback
-        traceback.print_exc()
+        logger.exception("Inbox processing failed")
         return {"status": "error", "reason": str(e)}
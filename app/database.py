@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import os
 
@@ -12,12 +13,25 @@ DATABASE_URL = os.getenv(
 )
 
 # Create engine with connection pooling
-engine = create_engine(
-    DATABASE_URL,
+_engine_kwargs = dict(
     echo=False,  # Set True for SQL debugging
-    pool_pre_ping=True  # Verify connections before use
+    pool_pre_ping=True,  # Verify connections before use
+    query_cache_size=1200  # Compiled-SQL cache; hot queries skip recompilation
 )
 
+if not DATABASE_URL.startswith("sqlite"):
+    # Pool sizing for Postgres. The defaults (pool_size=5, max_overflow=10)
+    # make concurrent dashboard requests queue on QueuePool.get(); recycle
+    # guards against the DB/router silently dropping idle connections.
+    _engine_kwargs.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    )
+
+engine = create_engine(DATABASE_URL, **_engine_kwargs)
+
 # Session factory for request-scoped sessions
 SessionLocal = sessionmaker(
     bind=engine,
@@ -48,3 +62,29 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+@contextmanager
+def db_scope():
+    """
+    Session scope for code running outside a request - background tasks
+    and pipeline worker threads. Sessions are not thread-safe, so each
+    worker opens its own here instead of sharing the request's.
+
+    Commits on success, rolls back on error, always closes:
+
+        with db_scope() as db:
+            ...
+
+    Yields:
+        Session: Database session scoped to the with block
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
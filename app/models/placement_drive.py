@@ -13,8 +13,9 @@ Expanded View Fields:
 
 from sqlalchemy import (
     Column, Integer, String, Date, Float, Text,
-    ForeignKey, DateTime, Index, Enum
+    ForeignKey, DateTime, Index, Enum, text
 )
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -82,16 +83,47 @@ class PlacementDrive(Base):
     # ============ INTERNAL TRACKING ============
     source_email_id = Column(Integer, ForeignKey("emails.id"))
     created_at = Column(DateTime, server_default=func.now())
-    last_updated = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # On sqlite, datetimes compare as strings: CURRENT_TIMESTAMP stores
+    # second precision while the default bind format appends .000000,
+    # which breaks the keyset-cursor comparisons on this column. The
+    # variant truncates microseconds so stored and bound values share
+    # one format; Postgres compares native timestamps and is unaffected.
+    last_updated = Column(
+        DateTime().with_variant(SQLITE_DATETIME(truncate_microseconds=True), "sqlite"),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     # Relationship to source email (internal use only)
     email = relationship("Email")
 
-    # Indexes for common dashboard queries
+    # Indexes for common dashboard queries and the ingestion upsert.
+    # The unique index doubles as the ON CONFLICT target for
+    # upsert_placement_drive; company is lowered so legacy rows saved
+    # with other casings still match, and batch/role are coalesced so
+    # two drives without a batch (NULLs never conflict) still count as
+    # the same.
     __table_args__ = (
         Index("ix_drives_batch_status", "batch", "status"),
         Index("ix_drives_company_batch", "company_name", "batch"),
+        Index(
+            "uq_drives_company_batch_role",
+            func.lower(company_name),
+            func.coalesce(batch, ""),
+            func.coalesce(role, ""),
+            unique=True,
+        ),
         Index("ix_drives_deadline", "registration_deadline"),
+        Index("ix_drives_last_updated_id", "last_updated", "id"),
+        # Partial index for the default dashboard view: only live drives
+        # are shown sorted by deadline, so closed/cancelled rows don't
+        # need to be in the index at all
+        Index(
+            "ix_drives_active_deadline",
+            "registration_deadline",
+            postgresql_where=text("status IN ('upcoming', 'open')"),
+            sqlite_where=text("status IN ('upcoming', 'open')"),
+        ),
     )
 
     def __repr__(self):
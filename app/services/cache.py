@@ -0,0 +1,59 @@
+"""
+Tiny in-process TTL cache for hot read endpoints.
+
+This deployment has no external cache (Redis/memcached), so results are
+cached per-process with a TTL plus explicit invalidation hooks called
+from the write paths. Good enough for single-digit-worker uvicorn; each
+worker keeps its own copy.
+"""
+
+import threading
+import time
+from typing import Any, Optional
+
+
+class TTLCache:
+    """Thread-safe key/value cache where entries expire after a fixed TTL."""
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value under key for the configured TTL."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, key: Any = None) -> None:
+        """Drop one key, or the whole cache when key is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+# Shared cache for the read-only dashboard endpoints (filter options,
+# stats, detailed listing). The TTL can be generous because every drive
+# write goes through db_service.upsert_placement_drive, which busts the
+# whole cache.
+dashboard_cache = TTLCache(ttl_seconds=300)
+
+# Extraction results keyed by content hash (see langgraph_pipeline's
+# extract_and_validate_node). Forwarded and re-sent emails share their
+# text, and identical text always extracts identically, so nothing ever
+# needs to invalidate this - the week-long TTL just bounds its size.
+extraction_cache = TTLCache(ttl_seconds=7 * 24 * 3600)
@@ -8,15 +8,18 @@ This module provides CRUD operations with smart upsert logic:
 - Dashboard queries with filtering
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
 from typing import Optional
 
 from app.models.email import Email
 from app.models.placement_drive import PlacementDrive
 from app.models.sync_state import SyncState
+from app.services.cache import dashboard_cache
 
 
 # ============ SYNC STATE OPERATIONS ============
@@ -54,10 +57,14 @@ def save_email(
 ) -> Email:
     """
     Save email with upsert logic.
-    
+
     If email with same gmail_message_id exists, return existing.
     Otherwise, create new email record.
-    
+
+    Dedup is enforced server-side with INSERT ... ON CONFLICT DO NOTHING
+    against the unique index on gmail_message_id, so no pre-check SELECT
+    is needed and concurrent inserts cannot race.
+
     Args:
         db: Database session
         gmail_message_id: Unique Gmail message ID
@@ -65,43 +72,103 @@ def save_email(
         subject: Email subject line
         raw_body: Full email body (HTML or text)
         received_at: When Gmail received the email
-        
+
     Returns:
         Email: Existing or newly created email record
     """
-    # Check if email already exists (deduplication)
-    existing = db.query(Email).filter(
-        Email.gmail_message_id == gmail_message_id
-    ).first()
-    
-    if existing:
-        return existing
-    
-    # Create new email record
-    email = Email(
+    stmt = pg_insert(Email).values(
         gmail_message_id=gmail_message_id,
         sender=sender,
         subject=subject,
         raw_body=raw_body,
         received_at=received_at or datetime.utcnow()
-    )
-    
-    db.add(email)
-    
+    ).on_conflict_do_nothing(
+        index_elements=["gmail_message_id"]
+    ).returning(Email.id)
+
+    inserted_id = db.execute(stmt).scalar()
+    db.commit()
+
+    if inserted_id is not None:
+        return db.get(Email, inserted_id)
+
+    # Conflict - another request (or an earlier run) already stored it
+    return db.query(Email).filter(
+        Email.gmail_message_id == gmail_message_id
+    ).first()
+
+
+def save_emails_bulk(db: Session, emails: list[dict]) -> dict[str, Email]:
+    """
+    Insert many emails in one flush + commit instead of one transaction each.
+
+    Callers are expected to have already filtered out existing
+    gmail_message_ids (see the IN-query prefilter in the extract
+    endpoints). A concurrent-insert race falls back to per-row upsert.
+
+    Args:
+        db: Database session
+        emails: List of dicts with gmail_message_id, sender, subject,
+            raw_body and optional received_at
+
+    Returns:
+        Dict mapping gmail_message_id -> persisted Email (ids assigned)
+    """
+    if not emails:
+        return {}
+
+    records = [
+        Email(
+            gmail_message_id=e["gmail_message_id"],
+            sender=e.get("sender"),
+            subject=e.get("subject"),
+            raw_body=e.get("raw_body"),
+            received_at=e.get("received_at") or datetime.utcnow()
+        )
+        for e in emails
+    ]
+
+    db.add_all(records)
+
     try:
         db.commit()
-        db.refresh(email)
-        return email
+        return {r.gmail_message_id: r for r in records}
     except IntegrityError:
-        # Race condition - another request created it
+        # Race condition - another request inserted one of these ids.
+        # Fall back to the per-row upsert path.
         db.rollback()
-        return db.query(Email).filter(
-            Email.gmail_message_id == gmail_message_id
-        ).first()
+        return {
+            e["gmail_message_id"]: save_email(
+                db=db,
+                gmail_message_id=e["gmail_message_id"],
+                sender=e.get("sender"),
+                subject=e.get("subject"),
+                raw_body=e.get("raw_body"),
+                received_at=e.get("received_at")
+            )
+            for e in emails
+        }
 
 
 # ============ PLACEMENT DRIVE OPERATIONS ============
 
+# Columns where an upsert only fills gaps: the incoming value wins when
+# non-null, otherwise the stored one is kept (COALESCE(excluded, current))
+_DRIVE_MERGE_COLS = (
+    "source_email_id", "company_logo", "drive_type", "drive_date",
+    "registration_deadline", "eligible_branches", "min_cgpa",
+    "eligibility_text", "ctc_or_stipend", "job_location",
+    "registration_link",
+)
+
+
+def _dialect_insert(db: Session):
+    """ON CONFLICT-capable insert() for the session's backend (pg/sqlite)."""
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite_insert
+    return pg_insert
+
+
 def upsert_placement_drive(
     db: Session,
     company_name: str,
@@ -120,51 +187,35 @@ def upsert_placement_drive(
     registration_link: str = None,
     status: str = "upcoming",
     confidence_score: float = 1.0,
-    official_source: str = "TPO Email"
+    official_source: str = "TPO Email",
+    commit: bool = True
 ) -> PlacementDrive:
     """
     Insert or update placement drive.
-    
+
     Upsert logic:
     - If drive with same (company_name, batch, role) exists → update
     - Otherwise → create new drive
-    
+
     This prevents duplicate drives from re-processed emails.
+
+    Runs as a single INSERT ... ON CONFLICT DO UPDATE against the
+    uq_drives_company_batch_role index - one round trip instead of
+    SELECT-then-write, with no race window between concurrent pipeline
+    workers. The only-overwrite-if-non-null merge happens in SQL via
+    COALESCE(EXCLUDED.col, current); status/confidence/source always
+    take the incoming value, matching the old Python-side merge. The
+    conflict target lowers company_name, so rows stored with any
+    casing match - same as the old case-insensitive SELECT.
+
+    With commit=False the change is only flushed, so batch callers can
+    upsert many drives and pay a single commit (one fsync) at the end
+    instead of one per drive.
     """
     # Normalize company name
     normalized_company = company_name.strip().title()
-    
-    # Look for existing drive with same company + batch + role
-    existing = db.query(PlacementDrive).filter(
-        func.lower(PlacementDrive.company_name) == normalized_company.lower(),
-        PlacementDrive.batch == batch,
-        PlacementDrive.role == role
-    ).first()
-    
-    if existing:
-        # Update existing drive with new info (only non-null values)
-        existing.source_email_id = source_email_id or existing.source_email_id
-        existing.company_logo = company_logo or existing.company_logo
-        existing.drive_type = drive_type or existing.drive_type
-        existing.drive_date = drive_date or existing.drive_date
-        existing.registration_deadline = registration_deadline or existing.registration_deadline
-        existing.eligible_branches = eligible_branches or existing.eligible_branches
-        existing.min_cgpa = min_cgpa if min_cgpa is not None else existing.min_cgpa
-        existing.eligibility_text = eligibility_text or existing.eligibility_text
-        existing.ctc_or_stipend = ctc_or_stipend or existing.ctc_or_stipend
-        existing.job_location = job_location or existing.job_location
-        existing.registration_link = registration_link or existing.registration_link
-        existing.status = status
-        existing.confidence_score = confidence_score
-        existing.official_source = official_source
-        # last_updated auto-updates via onupdate
-        
-        db.commit()
-        db.refresh(existing)
-        return existing
-    
-    # Create new drive
-    drive = PlacementDrive(
+
+    stmt = _dialect_insert(db)(PlacementDrive).values(
         company_name=normalized_company,
         source_email_id=source_email_id,
         company_logo=company_logo,
@@ -183,10 +234,40 @@ def upsert_placement_drive(
         confidence_score=confidence_score,
         official_source=official_source
     )
-    
-    db.add(drive)
-    db.commit()
-    db.refresh(drive)
+
+    set_ = {
+        col: func.coalesce(stmt.excluded[col], PlacementDrive.__table__.c[col])
+        for col in _DRIVE_MERGE_COLS
+    }
+    set_.update(
+        status=status,
+        confidence_score=confidence_score,
+        official_source=official_source,
+        # Explicit: ON CONFLICT set_ bypasses the column's onupdate
+        last_updated=func.now(),
+    )
+
+    stmt = stmt.on_conflict_do_update(
+        # text() so the expressions render as literals matching the
+        # index definition - a bound parameter here wouldn't be
+        # recognized as the uq_drives_company_batch_role target
+        index_elements=[
+            text("lower(company_name)"),
+            text("coalesce(batch, '')"),
+            text("coalesce(role, '')"),
+        ],
+        set_=set_
+    ).returning(PlacementDrive)
+
+    drive = db.execute(stmt).scalars().one()
+
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    # Cached dashboard payloads (filter options, stats, detailed
+    # list) are stale now; next read rebuilds them
+    dashboard_cache.invalidate()
     return drive
 
 
@@ -285,7 +366,9 @@ def get_all_drives(
     Returns:
         List of PlacementDrive objects
     """
-    query = db.query(PlacementDrive)
+    # Dashboard serialization never touches .email; raiseload turns an
+    # accidental lazy load (a per-row SELECT) into a loud error
+    query = db.query(PlacementDrive).options(raiseload(PlacementDrive.email))
     
     # Apply filters
     if batch:
@@ -308,6 +391,124 @@ def get_all_drives(
     return query.offset(skip).limit(limit).all()
 
 
+# Columns the card view renders, plus last_updated for keyset cursors.
+# Projecting just these skips ORM hydration and leaves the wide Text
+# columns (eligibility_text etc.) out of the result set entirely.
+_CARD_COLUMNS = (
+    PlacementDrive.id,
+    PlacementDrive.company_name,
+    PlacementDrive.company_logo,
+    PlacementDrive.role,
+    PlacementDrive.drive_type,
+    PlacementDrive.batch,
+    PlacementDrive.registration_deadline,
+    PlacementDrive.status,
+    PlacementDrive.last_updated,
+)
+
+
+def get_drives_page(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    batch: str = None,
+    company_name: str = None,
+    status: str = None,
+    drive_type: str = None
+) -> tuple[list, int]:
+    """
+    Fetch one page of drives plus the filtered total in a single query.
+
+    A COUNT(*) OVER () window column rides along with the page rows, so
+    the dashboard list does not evaluate the same predicates twice
+    (once for the page, once for the count). Rows are card-column
+    projections (Row tuples), not ORM instances.
+
+    Returns:
+        Tuple of (card rows for this page, total matching rows)
+    """
+    stmt = select(*_CARD_COLUMNS, func.count().over().label("total"))
+
+    if batch:
+        stmt = stmt.where(PlacementDrive.batch == batch)
+    if company_name:
+        stmt = stmt.where(PlacementDrive.company_name.ilike(f"%{company_name}%"))
+    if status:
+        stmt = stmt.where(PlacementDrive.status == status)
+    if drive_type:
+        stmt = stmt.where(PlacementDrive.drive_type == drive_type)
+
+    # id tiebreaker keeps this ordering identical to the keyset variant
+    stmt = stmt.order_by(
+        PlacementDrive.last_updated.desc(),
+        PlacementDrive.id.desc()
+    ).offset(skip).limit(limit)
+
+    rows = db.execute(stmt).all()
+
+    if not rows:
+        # Page ran past the end (or nothing matched) - the window count
+        # is unavailable, so fall back to a plain count
+        total = get_drives_count(
+            db,
+            batch=batch,
+            company_name=company_name,
+            status=status,
+            drive_type=drive_type
+        )
+        return [], total
+
+    return rows, rows[0].total
+
+
+def get_drives_keyset(
+    db: Session,
+    limit: int = 50,
+    after_last_updated: datetime = None,
+    after_id: int = None,
+    batch: str = None,
+    company_name: str = None,
+    status: str = None,
+    drive_type: str = None
+) -> list:
+    """
+    Keyset-paginated drive listing ordered by (last_updated, id) DESC.
+
+    Unlike OFFSET pagination, the DB never scans and discards `skip`
+    rows: each page is a range scan on (last_updated, id) of exactly
+    `limit` rows, so page latency is independent of how deep the caller
+    has paged. Pass the last row's (last_updated, id) from the previous
+    page to get the next one. Rows are card-column projections (Row
+    tuples), not ORM instances.
+    """
+    stmt = select(*_CARD_COLUMNS)
+
+    if batch:
+        stmt = stmt.where(PlacementDrive.batch == batch)
+    if company_name:
+        stmt = stmt.where(PlacementDrive.company_name.ilike(f"%{company_name}%"))
+    if status:
+        stmt = stmt.where(PlacementDrive.status == status)
+    if drive_type:
+        stmt = stmt.where(PlacementDrive.drive_type == drive_type)
+
+    if after_last_updated is not None and after_id is not None:
+        stmt = stmt.where(
+            or_(
+                PlacementDrive.last_updated < after_last_updated,
+                (PlacementDrive.last_updated == after_last_updated)
+                & (PlacementDrive.id < after_id),
+            )
+        )
+
+    stmt = stmt.order_by(
+        PlacementDrive.last_updated.desc(),
+        PlacementDrive.id.desc()
+    ).limit(limit)
+
+    return db.execute(stmt).all()
+
+
 def get_drives_count(
     db: Session,
     batch: str = None,
@@ -330,9 +531,96 @@ def get_drives_count(
     return query.scalar()
 
 
+def get_drives_for_dedup(db: Session, limit: int = None) -> list[dict]:
+    """
+    Lightweight projection of existing drives for duplicate checks.
+
+    Selects only the columns the dedup logic compares, returning plain
+    dicts from Row tuples instead of hydrating full ORM instances with
+    every column of every drive.
+
+    Returns:
+        List of dicts with company_name, role, registration_deadline
+        (ISO string) and batch
+    """
+    stmt = select(
+        PlacementDrive.company_name,
+        PlacementDrive.role,
+        PlacementDrive.registration_deadline,
+        PlacementDrive.batch,
+    )
+    if limit:
+        stmt = stmt.limit(limit)
+
+    return [
+        {
+            "company_name": company_name,
+            "role": role,
+            "registration_deadline": deadline.isoformat() if deadline else None,
+            "batch": batch,
+        }
+        for company_name, role, deadline, batch in db.execute(stmt)
+    ]
+
+
+def get_drive_stats(db: Session) -> dict:
+    """
+    Aggregate dashboard stats (total / by batch / by status / top locations).
+
+    One GROUP BY over (batch, status, job_location) scans the table a
+    single time; the per-dimension breakdowns and the total are pivoted
+    out of the grouped partial counts in Python. One round trip, one
+    scan, instead of four separate aggregate queries.
+
+    Returns:
+        Dict with total, by_batch, by_status and top_locations keys
+    """
+    stmt = select(
+        PlacementDrive.batch,
+        PlacementDrive.status,
+        PlacementDrive.job_location,
+        func.count(PlacementDrive.id),
+    ).group_by(
+        PlacementDrive.batch,
+        PlacementDrive.status,
+        PlacementDrive.job_location,
+    )
+
+    total = 0
+    by_batch: dict = {}
+    by_status: dict = {}
+    by_location: dict = {}
+
+    for batch, status, location, count in db.execute(stmt):
+        total += count
+        if batch:
+            by_batch[batch] = by_batch.get(batch, 0) + count
+        if status:
+            by_status[status] = by_status.get(status, 0) + count
+        if location:
+            by_location[location] = by_location.get(location, 0) + count
+
+    top_locations = dict(
+        sorted(by_location.items(), key=lambda item: item[1], reverse=True)[:10]
+    )
+
+    return {
+        "total": total,
+        "by_batch": by_batch,
+        "by_status": by_status,
+        "top_locations": top_locations,
+    }
+
+
 def get_drive_by_id(db: Session, drive_id: int) -> Optional[PlacementDrive]:
-    """Get a single placement drive by ID."""
-    return db.query(PlacementDrive).filter(
+    """Get a single placement drive by ID.
+
+    The expanded view serializes drive columns only, so the source
+    email relationship is raiseload-guarded like the list path.
+    """
+    return db.query(PlacementDrive).options(
+        raiseload(PlacementDrive.email)
+    ).filter(
         PlacementDrive.id == drive_id
     ).first()
 
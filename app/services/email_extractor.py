@@ -0,0 +1,40 @@
+"""
+Lightweight regex-only extractor for the debug endpoints.
+
+Thin wrapper around text_cleaner + regex_extractor that returns the
+legacy key names ("company" instead of "company_name") the debug
+extract endpoints were built against. For the full pipeline with
+Gemini enhancement, use langgraph_pipeline instead.
+"""
+
+from typing import Any, Dict, Optional
+
+from app.services.regex_extractor import extract_all_fields
+from app.services.text_cleaner import html_to_text, remove_noise
+
+
+def extract_placement_info(subject: str, body: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract placement fields from a raw email using regex only.
+
+    Args:
+        subject: Email subject line
+        body: Raw email body (HTML or plain text)
+
+    Returns:
+        Dict with 'company', 'role', 'batch', 'drive_type' and
+        'confidence' keys, or None if no company could be extracted
+    """
+    text = remove_noise(html_to_text(body or ""))
+    fields = extract_all_fields(text, subject or "")
+
+    if not fields.get("company_name"):
+        return None
+
+    return {
+        "company": fields["company_name"],
+        "role": fields.get("role"),
+        "batch": fields.get("batch"),
+        "drive_type": fields.get("drive_type"),
+        "confidence": fields.get("confidence_score", 0.0),
+    }
@@ -197,35 +197,54 @@ def validate_extracted_data(data: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
+def build_drive_index(existing_drives: list) -> Dict[str, list]:
+    """
+    Index drive dicts by normalized company name for O(1) dedup lookup.
+
+    check_duplicate only ever compares drives of the same company, so
+    instead of re-scanning a 1000-entry list per email, build
+    {company_lower: [(role_lower, deadline), ...]} once and probe the
+    dict. Callers that process batches should build this once and pass
+    it to every check.
+    """
+    index: Dict[str, list] = {}
+    for drive in existing_drives:
+        company = (drive.get('company_name') or '').lower().strip()
+        index.setdefault(company, []).append((
+            (drive.get('role') or '').lower().strip(),
+            drive.get('registration_deadline'),
+        ))
+    return index
+
+
 def check_duplicate(
     extracted: Dict[str, Any],
-    existing_drives: list
+    existing_drives
 ) -> bool:
     """
     Check if this placement drive already exists.
-    
+
     Args:
         extracted: Newly extracted data
-        existing_drives: List of existing drive dicts from DB
-        
+        existing_drives: Index from build_drive_index, or a raw list of
+            existing drive dicts from DB (indexed on the fly)
+
     Returns:
         True if duplicate exists
     """
     if not extracted.get('company_name'):
         return False
-    
+
+    if not isinstance(existing_drives, dict):
+        existing_drives = build_drive_index(existing_drives)
+
     new_company = extracted['company_name'].lower().strip()
     new_role = (extracted.get('role') or '').lower().strip()
     new_deadline = extracted.get('registration_deadline')
-    
-    for drive in existing_drives:
-        existing_company = (drive.get('company_name') or '').lower().strip()
-        existing_role = (drive.get('role') or '').lower().strip()
-        existing_deadline = drive.get('registration_deadline')
-        
-        if existing_company == new_company:
-            if existing_role == new_role or not new_role or not existing_role:
-                if existing_deadline == new_deadline or not new_deadline:
-                    return True
-    
+
+    for existing_role, existing_deadline in existing_drives.get(new_company, ()):
+        if existing_role == new_role or not new_role or not existing_role:
+            if existing_deadline == new_deadline or not new_deadline:
+                return True
+
     return False
@@ -1,36 +1,211 @@
+import fcntl
+import hashlib
+import json
+import logging
 import os
 import base64
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import httplib2
+import requests
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 
+logger = logging.getLogger(__name__)
+
 SCOPES = [
     "https://www.googleapis.com/auth/gmail.readonly",
     "https://www.googleapis.com/auth/gmail.modify"
 ]
 
+# Shared transport for OAuth token refreshes. Backing it with one
+# requests.Session keeps the TLS connection to oauth2.googleapis.com
+# alive across refreshes instead of paying a new handshake each time.
+GOOGLE_AUTH_REQUEST = Request(session=requests.Session())
+
+# In-process credential cache: (SHA-256 of token.json contents, Credentials).
+# Avoids re-parsing token.json on every authenticated request. Keying on a
+# content digest (never the raw token - it must not appear in keys or logs)
+# keeps the cache coherent however the file gets rewritten, including
+# external writers that preserve mtime.
+_creds_cache: Optional[Tuple[str, Credentials]] = None
+_creds_lock = threading.Lock()
+
+
+def get_token_file() -> str:
+    """Path to the OAuth token file (shared with the auth endpoints)."""
+    return os.getenv("GOOGLE_TOKEN_FILE", "token.json")
+
+
+def _hash_token(token_bytes: bytes) -> str:
+    """Constant-size, log-safe cache key for token material."""
+    return hashlib.sha256(token_bytes).hexdigest()
+
+
+def load_cached_credentials() -> Optional[Credentials]:
+    """
+    Load OAuth credentials, reusing the in-process copy while token.json is unchanged.
+
+    Returns None if no token file exists. The cached Credentials object is
+    re-parsed only when the file's content digest changes (e.g. after
+    /auth/callback or a refresh rewrites it).
+    """
+    global _creds_cache
+
+    token_file = get_token_file()
+    try:
+        with open(token_file, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None
+
+    digest = _hash_token(raw)
+
+    with _creds_lock:
+        if _creds_cache and _creds_cache[0] == digest:
+            return _creds_cache[1]
+
+        creds = Credentials.from_authorized_user_info(json.loads(raw), SCOPES)
+        _creds_cache = (digest, creds)
+        return creds
+
+
+def invalidate_credentials_cache() -> None:
+    """Drop the cached credentials (call after logout or external token writes)."""
+    global _creds_cache
+    with _creds_lock:
+        _creds_cache = None
+
+
+def save_token(creds: Credentials, token_file: Optional[str] = None) -> None:
+    """
+    Persist credentials to the token file atomically.
+
+    Writes to a temp file, fsyncs, then os.replace()s it into place while
+    holding an exclusive lock on a sidecar .lock file. This prevents torn
+    writes when multiple uvicorn workers refresh the token concurrently,
+    and readers never see a partially written token.json.
+    """
+    path = token_file or get_token_file()
+    tmp_path = path + ".tmp"
+    lock_path = path + ".lock"
+
+    with open(lock_path, "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            with open(tmp_path, "w") as tmp:
+                tmp.write(creds.to_json())
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    invalidate_credentials_cache()
+
+
+# Refresh the token this long before it actually expires, so no request
+# ever pays the Google token-endpoint round trip inline.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def refresh_credentials_if_needed() -> bool:
+    """
+    Refresh the OAuth token if it is expired or expiring soon.
+
+    Persists the refreshed token to token.json and invalidates the
+    in-process cache. Safe to call from multiple threads - only one
+    refresh runs at a time.
+
+    Returns:
+        True if a refresh was performed, False otherwise
+    """
+    creds = load_cached_credentials()
+    if not creds or not creds.refresh_token:
+        return False
+
+    # Still comfortably valid - nothing to do
+    if creds.valid and creds.expiry and datetime.utcnow() < creds.expiry - TOKEN_REFRESH_MARGIN:
+        return False
+
+    with _refresh_lock:
+        # Re-check under the lock in case another thread just refreshed
+        creds = load_cached_credentials()
+        if not creds or not creds.refresh_token:
+            return False
+        if creds.valid and creds.expiry and datetime.utcnow() < creds.expiry - TOKEN_REFRESH_MARGIN:
+            return False
+
+        creds.refresh(GOOGLE_AUTH_REQUEST)
+        save_token(creds)
+        return True
+
+
+def start_token_refresh_thread(interval_seconds: int = 60) -> None:
+    """
+    Start a daemon thread that preemptively refreshes the OAuth token.
+
+    Called once on app startup. The thread wakes every interval_seconds
+    and refreshes the token when it is within TOKEN_REFRESH_MARGIN of
+    expiry, so request paths always see a valid cached token.
+    """
+    global _refresh_thread
+
+    if _refresh_thread and _refresh_thread.is_alive():
+        return
+
+    def _loop():
+        while True:
+            try:
+                if refresh_credentials_if_needed():
+                    logger.info("OAuth token refreshed preemptively")
+            except Exception as e:
+                logger.warning("Background token refresh failed: %s", e)
+            time.sleep(interval_seconds)
+
+    _refresh_thread = threading.Thread(
+        target=_loop, name="token-refresh", daemon=True
+    )
+    _refresh_thread.start()
+
+
+# Per-thread cache of the built Gmail service, keyed on the Credentials
+# object it was built with. The discovery Resource wraps one httplib2
+# transport, which is not thread-safe, so the cache is thread-local
+# rather than a module global.
+_service_local = threading.local()
+
 
 def get_gmail_service():
     """
     Creates and returns an authenticated Gmail API service instance.
 
     On first run, opens browser for OAuth authentication and saves token.
-    Subsequent runs use cached token with automatic refresh if expired.
+    Subsequent runs reuse a per-thread service built from the cached
+    token, with automatic refresh if expired - rebuilding only when the
+    credentials change.
     """
     creds_file = os.getenv("GOOGLE_CREDENTIALS_FILE", "credentials.json")
-    token_file = os.getenv("GOOGLE_TOKEN_FILE", "token.json")
-    creds = None
+    token_file = get_token_file()
 
-    # Load existing token if available
-    if os.path.exists(token_file):
-        creds = Credentials.from_authorized_user_file(token_file, SCOPES)
+    # Load existing token if available (cached in-process)
+    creds = load_cached_credentials()
 
     # If no valid credentials, authenticate
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             # Refresh expired token
-            creds.refresh(Request())
+            creds.refresh(GOOGLE_AUTH_REQUEST)
         else:
             # Run OAuth flow (opens browser)
             flow = InstalledAppFlow.from_client_secrets_file(
@@ -39,41 +214,44 @@ def get_gmail_service():
             creds = flow.run_local_server(port=0)
 
         # Save credentials for next run
-        with open(token_file, "w") as token:
-            token.write(creds.to_json())
+        save_token(creds, token_file)
+        creds = load_cached_credentials() or creds
+
+    # Reuse this thread's service while the credentials are unchanged
+    if getattr(_service_local, "creds", None) is creds:
+        return _service_local.service
 
-    # Build and return Gmail service
     service = build("gmail", "v1", credentials=creds)
+    _service_local.creds = creds
+    _service_local.service = service
     return service
 
 
-def get_full_message(service, message_id: str) -> dict:
+# Gmail caps batch HTTP requests at 100 calls per round trip
+GMAIL_BATCH_SIZE = 100
+
+# Batch round trips to run in parallel for large fetches
+GMAIL_FETCH_WORKERS = int(os.getenv("GMAIL_FETCH_WORKERS", "4"))
+
+
+def _parse_message(msg: dict) -> dict:
     """
-    Fetch full email message including body content.
+    Parse a raw Gmail message resource into subject/from/body.
 
     Args:
-        service: Authenticated Gmail API service
-        message_id: Gmail message ID
+        msg: Raw message dict from messages.get (format="full")
 
     Returns:
         Dictionary with 'subject', 'from', and 'body' keys
     """
-    # Get full message with body
-    msg = service.users().messages().get(
-        userId="me",
-        id=message_id,
-        format="full"
-    ).execute()
-
-    # Extract headers
-    headers = msg["payload"]["headers"]
-    subject = sender = None
-
-    for h in headers:
-        if h["name"] == "Subject":
-            subject = h["value"]
-        if h["name"] == "From":
-            sender = h["value"]
+    # Extract the headers we care about in one pass
+    headers = {
+        h["name"]: h["value"]
+        for h in msg["payload"]["headers"]
+        if h["name"] in ("Subject", "From")
+    }
+    subject = headers.get("Subject")
+    sender = headers.get("From")
 
     # Extract body (handles multipart and simple messages)
     body = ""
@@ -112,6 +290,108 @@ def get_full_message(service, message_id: str) -> dict:
     }
 
 
+def get_full_message(service, message_id: str) -> dict:
+    """
+    Fetch full email message including body content.
+
+    Args:
+        service: Authenticated Gmail API service
+        message_id: Gmail message ID
+
+    Returns:
+        Dictionary with 'subject', 'from', and 'body' keys
+    """
+    # Get full message with body; only the payload is parsed, so ask
+    # Gmail to omit snippet/labels/etc. from the response
+    msg = service.users().messages().get(
+        userId="me",
+        id=message_id,
+        format="full",
+        fields="id,payload"
+    ).execute()
+
+    return _parse_message(msg)
+
+
+def get_full_messages(service, message_ids: list, include_body: bool = True) -> dict:
+    """
+    Fetch many full messages using batched HTTP requests.
+
+    Instead of one HTTPS round trip per message, this packs up to
+    GMAIL_BATCH_SIZE messages.get calls into a single batch request,
+    cutting network round trips by ~100x for large fetches.
+
+    Args:
+        service: Authenticated Gmail API service
+        message_ids: List of Gmail message IDs
+        include_body: When False, ask Gmail for format="metadata" with
+            just the Subject/From headers - far fewer bytes per message
+            for callers that never read the body
+
+    For fetches spanning several batches, the batch round trips
+    themselves run concurrently on a small thread pool (each on its own
+    authorized HTTP object - httplib2 is not thread-safe), so fetch
+    latency is bounded by the slowest batch rather than their sum.
+
+    Returns:
+        Dict mapping message_id -> parsed message (see _parse_message).
+        Messages that failed to fetch are omitted; 'body' is "" when
+        include_body is False.
+    """
+    results = {}
+
+    def _collect(request_id, response, exception):
+        if exception is not None:
+            logger.warning("Batch fetch failed for message %s: %s", request_id, exception)
+            return
+        results[request_id] = _parse_message(response)
+
+    chunks = [
+        message_ids[start:start + GMAIL_BATCH_SIZE]
+        for start in range(0, len(message_ids), GMAIL_BATCH_SIZE)
+    ]
+
+    if include_body:
+        get_kwargs = {"format": "full", "fields": "id,payload"}
+    else:
+        get_kwargs = {
+            "format": "metadata",
+            "metadataHeaders": ["Subject", "From"],
+            "fields": "id,payload/headers",
+        }
+
+    def _execute_chunk(chunk, http=None):
+        batch = service.new_batch_http_request(callback=_collect)
+        for msg_id in chunk:
+            batch.add(
+                service.users().messages().get(
+                    userId="me",
+                    id=msg_id,
+                    **get_kwargs
+                ),
+                request_id=msg_id
+            )
+        batch.execute(http=http)
+
+    creds = load_cached_credentials()
+
+    if len(chunks) <= 1 or creds is None:
+        # Single round trip (or no creds for per-thread transports)
+        for chunk in chunks:
+            _execute_chunk(chunk)
+        return results
+
+    with ThreadPoolExecutor(max_workers=GMAIL_FETCH_WORKERS) as pool:
+        futures = [
+            pool.submit(_execute_chunk, chunk, AuthorizedHttp(creds, http=httplib2.Http()))
+            for chunk in chunks
+        ]
+        for future in futures:
+            future.result()
+
+    return results
+
+
 def register_gmail_watch(service, project_id: str) -> dict:
     """
     Register Gmail push notifications via Cloud Pub/Sub.
@@ -175,6 +455,6 @@ def get_history_since(service, history_id: str) -> list:
     except Exception as e:
         # If history_id is too old, Gmail returns 404
         # In this case, return empty and let caller handle
-        print(f"⚠️ History API error: {e}")
+        logger.warning("History API error: %s", e)
         return []
 
@@ -12,7 +12,9 @@ Streamlined 6-node pipeline with conditional routing:
 
 from typing import TypedDict, List, Dict, Any, Optional
 from datetime import datetime
+import hashlib
 import os
+import re
 from langgraph.graph import StateGraph, START, END
 from sqlalchemy.orm import Session
 
@@ -21,8 +23,10 @@ from app.services.regex_extractor import extract_all_fields
 from app.services.gemini_extractor import (
     extract_with_gemini,
     validate_extracted_data,
-    check_duplicate
+    check_duplicate,
+    build_drive_index
 )
+from app.services.cache import extraction_cache
 
 # Allowed senders
 ALLOWED_SENDERS = [
@@ -41,6 +45,13 @@ PLACEMENT_KEYWORDS = [
     "company visit", "company drive", "batch 202", "passing out"
 ]
 
+# One alternation scan instead of ~20 substring passes over the text;
+# IGNORECASE also drops the per-email lowercase copy. No word
+# boundaries, matching the plain-substring semantics above.
+_PLACEMENT_KEYWORDS_RE = re.compile(
+    "|".join(re.escape(kw) for kw in PLACEMENT_KEYWORDS), re.IGNORECASE
+)
+
 
 class PipelineState(TypedDict):
     """State that flows through the LangGraph pipeline."""
@@ -65,7 +76,7 @@ class PipelineState(TypedDict):
     # Config
     api_key: Optional[str]
     use_gemini: bool
-    existing_drives: List[Dict]
+    existing_drives: Dict[str, list]  # dedup index from build_drive_index
     
     # Database (optional, for internal save)
     db: Optional[Any]
@@ -75,23 +86,29 @@ class PipelineState(TypedDict):
 
 # ============ NODE FUNCTIONS ============
 
-def filter_sender_node(state: PipelineState) -> dict:
-    """Node 1: Filter by sender AND placement keywords."""
-    sender_lower = state["sender"].lower()
+def is_allowed_sender(sender: str) -> bool:
+    """Whether this From header passes the placement-sender allowlist.
+
+    Shared with the webhook's metadata prefilter, which drops unknown
+    senders before paying for a full-body fetch.
+    """
+    sender_lower = sender.lower()
     sender_email = sender_lower.split('<')[-1].split('>')[0].strip()
-    
-    # Check sender
-    is_allowed = (
+    return (
         any(allowed in sender_lower or allowed in sender_email for allowed in ALLOWED_SENDERS)
         or '@iiit-bh.ac.in' in sender_email
     )
-    
-    if not is_allowed:
+
+
+def filter_sender_node(state: PipelineState) -> dict:
+    """Node 1: Filter by sender AND placement keywords."""
+    # Check sender
+    if not is_allowed_sender(state["sender"]):
         return {"status": "filtered", "error_message": f"Sender not allowed: {state['sender']}"}
     
     # Check placement keywords
-    combined = f"{state.get('subject', '').lower()} {(state.get('raw_body', '')[:500] or '').lower()}"
-    if not any(kw in combined for kw in PLACEMENT_KEYWORDS):
+    combined = f"{state.get('subject', '')} {state.get('raw_body', '')[:500] or ''}"
+    if not _PLACEMENT_KEYWORDS_RE.search(combined):
         return {"status": "filtered", "error_message": f"Not a placement email: {state.get('subject', '')[:50]}"}
     
     return {"status": "pending"}
@@ -107,7 +124,26 @@ def process_text_node(state: PipelineState) -> dict:
 
 
 def extract_and_validate_node(state: PipelineState) -> dict:
-    """Node 3: Extract fields (regex + optional Gemini) and validate."""
+    """Node 3: Extract fields (regex + optional Gemini) and validate.
+
+    Results are cached by a hash of the cleaned text, so a forwarded or
+    re-sent copy of an email we already extracted skips the Gemini call
+    (the dominant cost of the pipeline) and reuses the validated data.
+    Dedup and save still run per message.
+    """
+    # clean_text is already normalized (HTML stripped, noise and
+    # whitespace collapsed), which is what makes forwards hash-equal
+    cache_key = hashlib.sha256(
+        f"{state.get('subject', '')}\x00{state.get('clean_text', '')}".encode()
+    ).hexdigest()
+    cached = extraction_cache.get(cache_key)
+    if cached is not None:
+        validated = dict(cached)
+        return {
+            "extracted_data": validated,
+            "status": "needs_review" if validated.get("needs_review") else "extracted"
+        }
+
     try:
         # Regex extraction (always)
         data = extract_all_fields(
@@ -141,7 +177,12 @@ def extract_and_validate_node(state: PipelineState) -> dict:
             validated["status"] = "upcoming"
         if not validated.get("official_source"):
             validated["official_source"] = "TPO Email"
-        
+
+        # Only cache results Gemini actually enhanced - regex-only runs
+        # are cheap to redo and may just mean the API key was missing
+        if validated.get("extraction_method") == "regex+gemini":
+            extraction_cache.set(cache_key, dict(validated))
+
         return {
             "extracted_data": validated,
             "status": "needs_review" if validated.get("needs_review") else "extracted"
@@ -278,6 +319,13 @@ def build_pipeline() -> StateGraph:
 pipeline = build_pipeline()
 
 
+def _ensure_drive_index(existing_drives) -> Dict[str, list]:
+    """Accept a prebuilt dedup index or a raw drive list, return an index."""
+    if isinstance(existing_drives, dict):
+        return existing_drives
+    return build_drive_index(existing_drives or [])
+
+
 def run_langgraph_pipeline(
     email_id: str,
     gmail_message_id: str,
@@ -303,7 +351,7 @@ def run_langgraph_pipeline(
         "error_message": None,
         "api_key": api_key,
         "use_gemini": use_gemini,
-        "existing_drives": existing_drives or [],
+        "existing_drives": _ensure_drive_index(existing_drives),
         "db": db,
         "saved_email_id": None,
         "saved_drive_id": None,
@@ -312,6 +360,62 @@ def run_langgraph_pipeline(
     return pipeline.invoke(initial_state)
 
 
+def run_langgraph_pipeline_batch(
+    emails: List[Dict[str, Any]],
+    existing_drives: List[Dict] = None,
+    api_key: str = None,
+    use_gemini: bool = True,
+    max_concurrency: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Run the pipeline over many emails concurrently.
+
+    Each email's run is independent and dominated by the Gemini call, so
+    the compiled graph's batch() executes up to max_concurrency
+    invocations in parallel instead of one graph at a time. No db
+    session is threaded through here - a shared Session is not
+    thread-safe, so callers persist the returned states themselves.
+
+    Args:
+        emails: Dicts with email_id, gmail_message_id, sender, subject
+            and raw_body keys
+        existing_drives: Dedup index (or raw drive list, indexed once)
+            shared by every invocation
+        max_concurrency: Parallel invocation cap (respects Gemini QPS)
+
+    Returns:
+        Final pipeline states, in the same order as emails
+    """
+    shared_drives = _ensure_drive_index(existing_drives)
+
+    states: List[PipelineState] = [
+        {
+            "email_id": e["email_id"],
+            "gmail_message_id": e["gmail_message_id"],
+            "sender": e.get("sender", ""),
+            "subject": e.get("subject", ""),
+            "raw_body": e.get("raw_body", ""),
+            "clean_text": "",
+            "excerpts": [],
+            "extracted_data": {},
+            "status": "pending",
+            "error_message": None,
+            "api_key": api_key,
+            "use_gemini": use_gemini,
+            "existing_drives": shared_drives,
+            "db": None,
+            "saved_email_id": None,
+            "saved_drive_id": None,
+        }
+        for e in emails
+    ]
+
+    if not states:
+        return []
+
+    return pipeline.batch(states, config={"max_concurrency": max_concurrency})
+
+
 def pipeline_result_to_json(state: Dict[str, Any]) -> Dict[str, Any]:
     """Convert pipeline state to JSON response."""
     return {
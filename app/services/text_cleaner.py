@@ -12,6 +12,16 @@ import re
 from bs4 import BeautifulSoup
 from typing import Tuple, List
 
+# Prefer the C-backed lxml tree builder - roughly an order of magnitude
+# faster than the pure-Python html.parser on typical HTML emails, which
+# makes parsing the dominant cost of the text pipeline. Falls back
+# cleanly if lxml isn't installed.
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
 # Maximum tokens before trimming (1 token ≈ 4 chars)
 MAX_CHARS = 12000  # ~3000 tokens
 
@@ -75,7 +85,7 @@ def html_to_text(raw_html: str) -> str:
     if not raw_html:
         return ""
     
-    soup = BeautifulSoup(raw_html, "html.parser")
+    soup = BeautifulSoup(raw_html, _BS_PARSER)
     
     # Remove script, style, and head tags
     for tag in soup(['script', 'style', 'head', 'meta', 'link']):
@@ -1,19 +1,57 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
 from app.api.v1.api import api_router
 from app.database import engine, Base, SessionLocal
 from app.models import Email, PlacementDrive, SyncState
+import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime, timedelta
 
 # Load environment variables from .env
 from dotenv import load_dotenv
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+_log_listener = None
+
+
+def _configure_logging():
+    """Route app logging through a queue so emitters never block on I/O.
+
+    Handlers write to stderr from a QueueListener thread; the hot paths
+    (webhook workers, pipeline threads) only ever pay the cost of a
+    queue put. No-op if the root logger is already configured, e.g. by
+    gunicorn.
+    """
+    global _log_listener
+
+    root = logging.getLogger()
+    if root.handlers or _log_listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s - %(message)s"
+    ))
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+
 app = FastAPI(
     title="Placement Pipeline",
     description="Automated extraction of placement info from emails",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson serializes ~5-10x faster than json
 )
 
 origins = [
@@ -32,18 +70,81 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON responses (stats, drive lists) when the client
+# sends Accept-Encoding: gzip; small payloads are left alone
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+
+def _ensure_drive_indexes():
+    """Create the drive indexes added after 1.0 on pre-existing databases.
+
+    Base.metadata.create_all only creates missing tables - it never
+    adds indexes to tables that already exist, and there is no
+    migration tool here. Databases created before these indexes get
+    them added here; IF NOT EXISTS makes this a no-op everywhere else
+    (fresh databases get them from create_all).
+    """
+    with engine.begin() as conn:
+        # Keyset pagination order and the live-drives dashboard view
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_drives_last_updated_id "
+            "ON placement_drives (last_updated, id)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_drives_active_deadline "
+            "ON placement_drives (registration_deadline) "
+            "WHERE status IN ('upcoming', 'open')"
+        ))
+
+    # The upsert's ON CONFLICT target. Kept separate: it is the one
+    # index that can fail to build (on duplicate rows), and drive
+    # writes depend on it existing.
+    try:
+        with engine.begin() as conn:
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_drives_company_batch_role "
+                "ON placement_drives "
+                "(lower(company_name), coalesce(batch, ''), coalesce(role, ''))"
+            ))
+    except Exception as e:
+        # Most likely pre-existing duplicate (company, batch, role)
+        # rows blocking the unique index; drive writes will keep
+        # failing until they are merged and the index can be built
+        logger.error(
+            "Could not create uq_drives_company_batch_role (%s) - merge duplicate "
+            "(company_name, batch, role) drive rows and restart; drive upserts "
+            "will fail until this index exists", e
+        )
+
 
 @app.on_event("startup")
 def on_startup():
     """Create database tables and check Gmail watch status on startup."""
+    _configure_logging()
+
     Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created/verified")
-    
+    _ensure_drive_indexes()
+    logger.info("Database tables created/verified")
+
+    # Keep the OAuth token fresh in the background so request paths
+    # never pay the refresh round trip inline
+    from app.services.gmail_service import start_token_refresh_thread
+    start_token_refresh_thread()
+
     # Check and renew Gmail watch if needed
     try:
         check_and_renew_gmail_watch()
     except Exception as e:
-        print(f"⚠️  Gmail watch check failed (non-critical): {str(e)}")
+        logger.warning("Gmail watch check failed (non-critical): %s", e)
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Drain and stop the logging queue listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
 
 
 def check_and_renew_gmail_watch():
@@ -58,7 +159,7 @@ def check_and_renew_gmail_watch():
     project_id = os.getenv("GCP_PROJECT_ID")
     
     if not project_id or project_id == "YOUR_PROJECT_ID_HERE":
-        print("⚠️  GCP_PROJECT_ID not configured - skipping Gmail watch check")
+        logger.warning("GCP_PROJECT_ID not configured - skipping Gmail watch check")
         return
     
     db = SessionLocal()
@@ -73,7 +174,7 @@ def check_and_renew_gmail_watch():
         
         if not watch_expiration:
             # No watch registered, need to create one
-            print("📧 No Gmail watch found - will register on first email")
+            logger.info("No Gmail watch found - will register on first email")
             should_renew = False  # Don't auto-register, let user do it manually
         else:
             # Check if expired or expiring soon (within 24 hours)
@@ -81,16 +182,16 @@ def check_and_renew_gmail_watch():
                 expiration_timestamp = int(watch_expiration) / 1000  # Convert ms to seconds
                 expiration_date = datetime.fromtimestamp(expiration_timestamp)
                 time_until_expiry = expiration_date - datetime.now()
-                
+
                 if time_until_expiry < timedelta(hours=24):
-                    print(f"⏰ Gmail watch expiring soon ({time_until_expiry}) - renewing...")
+                    logger.info("Gmail watch expiring soon (%s) - renewing...", time_until_expiry)
                     should_renew = True
                 else:
-                    print(f"✅ Gmail watch active until {expiration_date.strftime('%Y-%m-%d %H:%M:%S')}")
+                    logger.info("Gmail watch active until %s", expiration_date.strftime('%Y-%m-%d %H:%M:%S'))
                     should_renew = False
             except (ValueError, OSError):
                 # Invalid expiration format, renew to be safe
-                print("⚠️  Invalid watch expiration format - renewing...")
+                logger.warning("Invalid watch expiration format - renewing...")
                 should_renew = True
         
         if should_renew:
@@ -107,14 +208,15 @@ def check_and_renew_gmail_watch():
                     db_service.set_sync_state(db, "gmail_history_id", new_history_id)
                 
                 expiration_date = datetime.fromtimestamp(int(new_expiration) / 1000)
-                print(f"✅ Gmail watch renewed - expires {expiration_date.strftime('%Y-%m-%d %H:%M:%S')}")
-                
+                logger.info("Gmail watch renewed - expires %s", expiration_date.strftime('%Y-%m-%d %H:%M:%S'))
+
             except Exception as e:
-                print(f"❌ Failed to renew Gmail watch: {str(e)}")
-                print("   You can manually renew using: POST /api/v1/gmail/watch/start")
-        
+                logger.error(
+                    "Failed to renew Gmail watch: %s - renew manually with POST /api/v1/gmail/watch/start", e
+                )
+
     except Exception as e:
-        print(f"⚠️  Error checking Gmail watch: {str(e)}")
+        logger.warning("Error checking Gmail watch: %s", e)
     finally:
         db.close()
 